@@ -0,0 +1,120 @@
+"""assign-employee and auto-assign: set-based writes to employee_task.
+
+Selections are validated and inserted with a handful of statements
+whatever their size; see find_existing.
+"""
+import click
+from sqlalchemy import select, insert, func
+from database import sessionLocal
+from models import Task, Employee, employee_task
+from queries import (
+    id_part_clause, missing_ranges_query, id_spec_clause, task_selection, bulk_assign_statement,
+    unassigned_tasks_query, open_load_query,
+)
+from idspec import gap_ids, describe_missing
+
+
+def find_existing(session, id_column, label_column, clauses, spec, limit=10):
+    """Validate an id selection without expanding its ranges.
+
+    Each range of the spec, and its single ids together, is counted in SQL
+    against its size; only parts that come up short are searched for the
+    ids they miss, at most limit of them in all. Returns (rows matched,
+    {id: label} if the spec is a single id else None, missing ids, number
+    of ids missing). 'all' selections are only counted.
+    """
+    if spec.everything:
+        return session.execute(select(func.count(id_column)).where(*clauses)).scalar(), None, [], 0
+    found, missing, missing_count = 0, [], 0
+    for part in spec.parts():
+        part_clause = id_part_clause(id_column, part)
+        count = session.execute(select(func.count(id_column)).where(part_clause, *clauses)).scalar()
+        found += count
+        if count == len(part):
+            continue
+        missing_count += len(part) - count
+        if len(missing) >= limit:
+            continue
+        if isinstance(part, range):
+            low, high = part.start, part.stop - 1
+            gaps = session.execute(missing_ranges_query(id_column, low, high, clauses, limit - len(missing))).all()
+            missing += gap_ids(gaps, low, high, len(part) - count, limit - len(missing))
+        else:
+            present = set(session.execute(select(id_column).where(part_clause, *clauses)).scalars())
+            missing += [i for i in part if i not in present][:limit - len(missing)]
+    labels = None
+    if spec.size() == 1 and found:
+        labels = dict(session.execute(select(id_column, label_column).where(*clauses)).tuples().all())
+    return found, labels, missing, missing_count
+
+
+def assign_employees(task_ids, employee_ids, project_id):
+    """Body of assign-employee"""
+    session = sessionLocal()
+    try:
+        task_clauses = task_selection(task_ids, project_id)
+        employee_clause = id_spec_clause(Employee.id, employee_ids)
+        tasks, task_titles, missing_tasks, missing_task_count = find_existing(
+            session, Task.id, Task.title, task_clauses, task_ids)
+        employees, employee_names, missing_employees, missing_employee_count = find_existing(
+            session, Employee.id, Employee.name, [employee_clause], employee_ids)
+        single = task_ids.size() == 1 and employee_ids.size() == 1
+        if single and (missing_tasks or missing_employees):
+            click.echo("Task or Employee not found.")
+            return
+        if missing_tasks:
+            scope = f" in project {project_id}" if project_id is not None else ""
+            click.echo(f"Tasks not found{scope}: {describe_missing(missing_tasks, missing_task_count)}. Nothing was assigned.")
+            return
+        if missing_employees:
+            click.echo(f"Employees not found: {describe_missing(missing_employees, missing_employee_count)}. Nothing was assigned.")
+            return
+        if not tasks or not employees:
+            click.echo("No matching tasks or employees. Nothing was assigned.")
+            return
+        inserted = session.execute(bulk_assign_statement(task_clauses, employee_clause)).rowcount
+        session.commit()
+        if single:
+            (employee_name,), (task_title,) = employee_names.values(), task_titles.values()
+            if inserted:
+                click.echo(f"Employee {employee_name} assigned to task {task_title}.")
+            else:
+                click.echo(f"Employee {employee_name} is already assigned to task {task_title}.")
+            return
+        pairs = tasks * employees
+        click.echo(f"Assigned {employees} employees to {tasks} tasks: "
+                   f"{inserted} new assignments, {pairs - inserted} already existed.")
+    except Exception as e:
+        session.rollback()
+        click.echo(f"Error assigning employee: {e}")
+    finally:
+        session.close()
+
+
+def auto_assign_tasks(project_id, role, dry_run):
+    """Body of auto-assign"""
+    from scheduling import balance
+    session = sessionLocal()
+    try:
+        loads = session.execute(open_load_query(role)).tuples().all()
+        if not loads:
+            click.echo(f"No employees{f' with role {role}' if role is not None else ''}. Nothing was assigned.")
+            return
+        pairs, final = balance(session.execute(unassigned_tasks_query(project_id)).tuples(), loads)
+        if not pairs:
+            click.echo("No unassigned open tasks.")
+            return
+        if not dry_run:
+            session.execute(insert(employee_task), [
+                {'employee_id': employee_id, 'task_id': task_id} for employee_id, task_id in pairs
+            ])
+            session.commit()
+        days = [load[0] for load in final]
+        receiving = len({employee_id for employee_id, _ in pairs})
+        click.echo(f"{'Would assign' if dry_run else 'Assigned'} {len(pairs)} tasks to {receiving} employees. "
+                   f"Open work per employee now ranges from {min(days)} to {max(days)} days.")
+    except Exception as e:
+        session.rollback()
+        click.echo(f"Error assigning tasks: {e}")
+    finally:
+        session.close()
@@ -0,0 +1,6 @@
+"""Benchmarks for the Project Management CLI.
+
+Each module is runnable with ``python -m benchmarks.<module>`` from the
+repository root and works on a scratch SQLite file, never on the real
+database.
+"""
@@ -0,0 +1,3 @@
+from benchmarks.runner import main
+
+main(prog_name="python -m benchmarks")
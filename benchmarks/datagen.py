@@ -0,0 +1,104 @@
+"""Deterministic synthetic datasets.
+
+The same (sizes, skew, seed) always produces the same rows, so numbers
+from different runs and releases are comparable. Skew is the exponent of a
+Zipf-like distribution: 0 spreads tasks evenly over projects and
+assignments evenly over employees, 1.0 gives a few very large projects and
+a few heavily loaded employees.
+"""
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+from models import Project, Employee, Task, employee_task
+from choices import Priority
+
+# Stored values, in the order the previous string choices were drawn
+PRIORITIES = [int(priority) for priority in Priority]
+ROLES = ["Developer", "Designer", "Analyst", "Tester", "Manager"]
+BATCH_SIZE = 50000
+EPOCH = datetime(2025, 1, 1)
+# Longest time a generated task takes from creation to completion
+HISTORY_DAYS = 120
+
+
+def zipf_weights(count, skew):
+    weights = [1.0 / (rank ** skew) for rank in range(1, count + 1)]
+    return list(itertools.accumulate(weights))
+
+
+def batched(rows, size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate(engine, projects=100, tasks=100000, employees=1000, assignments=1.5, skew=0.8, seed=42, completed=0.3):
+    """Fill an empty schema and return a summary of what was inserted.
+
+    assignments is the approximate mean number of employees per task.
+    """
+    rng = random.Random(seed)
+    # Timestamps come from their own generator so that adding them left
+    # every other generated value as it was
+    clock = random.Random(f"{seed}-timestamps")
+    started = time.perf_counter()
+    project_weights = zipf_weights(projects, skew)
+    employee_weights = zipf_weights(employees, skew)
+    project_ids = range(1, projects + 1)
+    employee_ids = range(1, employees + 1)
+
+    def task_rows():
+        for task_id in range(1, tasks + 1):
+            row = {
+                "id": task_id,
+                "title": f"Task {task_id}",
+                "description": f"Synthetic task {task_id}",
+                "deadline": EPOCH + timedelta(days=rng.randrange(730)),
+                "priority": rng.choice(PRIORITIES),
+                "completed": rng.random() < completed,
+                "project_id": rng.choices(project_ids, cum_weights=project_weights)[0],
+            }
+            # Created during the year before EPOCH, completed up to HISTORY_DAYS later
+            row["created_at"] = EPOCH - timedelta(seconds=clock.randrange(365 * 86400))
+            row["completed_at"] = (
+                row["created_at"] + timedelta(seconds=clock.randrange(HISTORY_DAYS * 86400)) if row["completed"] else None
+            )
+            yield row
+
+    def assignment_rows():
+        for task_id in range(1, tasks + 1):
+            count = min(employees, int(rng.expovariate(1 / assignments)) if assignments else 0)
+            chosen = set(rng.choices(employee_ids, cum_weights=employee_weights, k=count))
+            for employee_id in sorted(chosen):
+                yield {"employee_id": employee_id, "task_id": task_id}
+
+    assigned = 0
+    with engine.begin() as conn:
+        conn.execute(Project.__table__.insert(), [
+            {"id": i, "name": f"Project {i}", "description": f"Synthetic project {i}",
+             "deadline": EPOCH + timedelta(days=rng.randrange(365, 1095))}
+            for i in project_ids
+        ])
+        conn.execute(Employee.__table__.insert(), [
+            {"id": i, "name": f"Employee {i}", "role": rng.choice(ROLES)} for i in employee_ids
+        ])
+        for batch in batched(task_rows()):
+            conn.execute(Task.__table__.insert(), batch)
+        for batch in batched(assignment_rows()):
+            conn.execute(employee_task.insert(), batch)
+            assigned += len(batch)
+    return {
+        "projects": projects,
+        "tasks": tasks,
+        "employees": employees,
+        "assignments": assigned,
+        "skew": skew,
+        "seed": seed,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
@@ -0,0 +1,195 @@
+"""Sustained load against `main.py serve` on a synthetic dataset.
+
+    python -m benchmarks.loadtest --tasks 100000 --connections 16 --duration 10
+    python -m benchmarks.loadtest --url http://127.0.0.1:8080 --only GET
+
+Generates a dataset in a scratch SQLite file, starts the server on it in a
+separate process and, for each scenario in turn, keeps --connections
+keep-alive clients sending requests for --duration seconds. Reports
+requests/sec, client-side latency percentiles and the server's own mean
+wait, db and total time (from Server-Timing) as JSON. With --url the
+requests go to a server that is already running and no dataset is
+generated.
+"""
+from benchmarks import scratch  # noqa: F401  must precede database imports
+
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+import click
+from database import Base, engine
+from benchmarks import datagen
+from benchmarks.runner import percentile
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds to wait for a started server to accept connections
+STARTUP_TIMEOUT = 30
+
+
+def scenarios(dataset, seed):
+    """(name, request builder) pairs; a builder returns (method, path, body)"""
+    rng = random.Random(seed)
+    projects, tasks, employees = dataset["projects"], dataset["tasks"], dataset["employees"]
+    return [
+        ("GET /workload?sort=tasks&top=10", lambda: ("GET", "/workload?sort=tasks&top=10", None)),
+        ("GET /report", lambda: ("GET", "/report", None)),
+        ("POST /tasks", lambda: ("POST", "/tasks", {
+            "project_id": rng.randint(1, projects), "title": "Load test task",
+            "deadline": "2030-06-30", "priority": rng.choice(["Low", "Medium", "High"]),
+        })),
+        ("POST /assignments", lambda: ("POST", "/assignments", {
+            "task_ids": rng.randint(1, tasks), "employee_ids": rng.randint(1, employees),
+        })),
+        ("POST /employees", lambda: ("POST", "/employees", {"name": "Load test employee", "role": "Developer"})),
+    ]
+
+
+def server_timing(value):
+    """{'wait': ms, 'db': ms, 'total': ms} from a Server-Timing header"""
+    timings = {}
+    for metric in value.split(","):
+        name, _, duration = metric.strip().partition(";dur=")
+        if duration:
+            timings[name] = float(duration)
+    return timings
+
+
+async def client(host, port, build, deadline, results):
+    """Send requests over one keep-alive connection until deadline"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            method, path, payload = build()
+            body = json.dumps(payload).encode() if payload is not None else b""
+            head = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n\r\n"
+            started = time.perf_counter()
+            writer.write(head.encode() + body)
+            await writer.drain()
+            status_line, *header_lines = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+            headers = {}
+            for line in header_lines:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            await reader.readexactly(int(headers.get("content-length", 0)))
+            results["latencies"].append((time.perf_counter() - started) * 1000)
+            status = int(status_line.split(" ")[1])
+            if status >= 400:
+                results["errors"] += 1
+            timing = server_timing(headers.get("server-timing", ""))
+            results["wait"].append(timing.get("wait", 0.0))
+            results["db"].append(timing.get("db", 0.0))
+            results["total"].append(timing.get("total", 0.0))
+    finally:
+        writer.close()
+
+
+async def run_scenario(host, port, build, connections, duration):
+    results = {"latencies": [], "wait": [], "db": [], "total": [], "errors": 0}
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(client(host, port, build, deadline, results) for _ in range(connections)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(results["latencies"])
+    return {
+        "requests": len(latencies),
+        "errors": results["errors"],
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p90_ms": round(percentile(latencies, 0.90), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "server_wait_mean_ms": round(statistics.mean(results["wait"]), 3),
+        "server_db_mean_ms": round(statistics.mean(results["db"]), 3),
+        "server_total_mean_ms": round(statistics.mean(results["total"]), 3),
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, pool_size):
+    process = subprocess.Popen(
+        [sys.executable, "main.py", "serve", "--port", str(port), "--pool-size", str(pool_size)],
+        cwd=HERE, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise click.ClickException("server exited during start-up")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise click.ClickException(f"server did not accept connections within {STARTUP_TIMEOUT}s")
+
+
+@click.command()
+@click.option("--url", help="Load an already running server instead of starting one on a scratch dataset")
+@click.option("--projects", default=100, show_default=True, help="Projects in the dataset")
+@click.option("--tasks", default=100000, show_default=True, help="Tasks in the dataset")
+@click.option("--employees", default=1000, show_default=True, help="Employees in the dataset")
+@click.option("--seed", default=42, show_default=True, help="Random seed for the dataset and request bodies")
+@click.option("--connections", type=click.IntRange(min=1), default=16, show_default=True, help="Concurrent keep-alive clients")
+@click.option("--duration", type=click.FloatRange(min=0.1), default=10.0, show_default=True, help="Seconds of load per scenario")
+@click.option("--pool-size", type=click.IntRange(min=1), default=5, show_default=True, help="--pool-size of the started server")
+@click.option("--only", multiple=True, help="Only scenarios starting with this text, e.g. GET (repeatable)")
+@click.option("--output", "-o", type=click.File("w"), default="-", help="Write the JSON report here (default: stdout)")
+def main(url, projects, tasks, employees, seed, connections, duration, pool_size, only, output):
+    """Measure sustained requests/sec of the HTTP API"""
+    process = None
+    try:
+        if url:
+            parts = urlsplit(url)
+            host, port = parts.hostname, parts.port or 80
+            # Only the id ranges are needed for request bodies
+            dataset = {"projects": projects, "tasks": tasks, "employees": employees}
+        else:
+            scratch.remove()
+            Base.metadata.create_all(engine)
+            click.echo(f"Generating dataset in {scratch.PATH} ...", err=True)
+            dataset = datagen.generate(engine, projects=projects, tasks=tasks, employees=employees, seed=seed)
+            engine.dispose()
+            host, port = "127.0.0.1", free_port()
+            process = start_server(port, pool_size)
+        results = {}
+        for name, build in scenarios(dataset, seed):
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            click.echo(f"Loading {name} ...", err=True)
+            results[name] = asyncio.run(run_scenario(host, port, build, connections, duration))
+        report = {
+            "environment": {
+                "python": platform.python_version(),
+                "sqlite": sqlite3.sqlite_version,
+                "platform": platform.platform(),
+                "connections": connections,
+                "pool_size": None if url else pool_size,
+            },
+            "dataset": dataset,
+            "scenarios": results,
+        }
+        json.dump(report, output, indent=2)
+        output.write("\n")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+            scratch.remove()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""End-to-end benchmark of every CLI command on a synthetic dataset.
+
+    python -m benchmarks --tasks 200000 --runs 50 --output bench.json
+    python main.py bench --tasks 200000
+
+Commands run in-process through click, so the numbers are per-command
+cost without interpreter startup. Each command gets --runs timed runs
+for the latency percentiles, then one extra run with the query profiler
+and tracemalloc enabled for its statement count and peak memory (kept
+out of the timed runs because both slow Python down).
+"""
+from benchmarks import scratch  # noqa: F401  must precede database imports
+
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import time
+import tracemalloc
+import click
+from click.testing import CliRunner
+import database
+from database import Base, engine, use_sqlite_profile
+from choices import SQLITE_PROFILES
+from profiling import QueryProfiler
+from benchmarks import datagen
+from main import cli
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class CommandBench:
+    """Runs one CLI command repeatedly and collects its measurements"""
+
+    def __init__(self, runner, name, args_for_run):
+        self.runner = runner
+        self.name = name
+        self.args_for_run = args_for_run
+        self.timings = []
+        self.run_index = 0
+
+    def invoke(self):
+        args = self.args_for_run(self.run_index)
+        self.run_index += 1
+        result = self.runner.invoke(cli, args)
+        if result.exit_code != 0 or result.output.startswith("Error"):
+            raise click.ClickException(f"{' '.join(map(str, args))} failed: {result.output.strip()}")
+
+    def run(self, runs):
+        for _ in range(runs):
+            started = time.perf_counter()
+            self.invoke()
+            self.timings.append((time.perf_counter() - started) * 1000)
+        profiler = QueryProfiler(engine)
+        profiler.install()
+        tracemalloc.start()
+        try:
+            self.invoke()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            profiler.remove()
+        summary = profiler.summary()
+        timings = sorted(self.timings)
+        return {
+            "runs": runs,
+            "p50_ms": round(percentile(timings, 0.50), 3),
+            "p90_ms": round(percentile(timings, 0.90), 3),
+            "p99_ms": round(percentile(timings, 0.99), 3),
+            "mean_ms": round(statistics.mean(timings), 3),
+            "max_ms": round(timings[-1], 3),
+            "statements": summary["statements"],
+            "rows": summary["rows"],
+            "peak_memory_kb": round(peak / 1024, 1),
+        }
+
+
+def command_plan(dataset, seed):
+    """(name, args builder) for every benchmarked command, in run order"""
+    rng = random.Random(seed)
+    projects, employees = dataset["projects"], dataset["employees"]
+    first_new_task = dataset["tasks"] + 1
+    return [
+        ("create-project", lambda i: ["create-project", f"Bench project {i}", "--deadline", "2030-01-01"]),
+        ("add-employee", lambda i: ["add-employee", f"Bench employee {i}", "Developer"]),
+        ("add-task", lambda i: ["add-task", str(rng.randint(1, projects)), f"Bench task {i}", "Benchmark task",
+                                "--deadline", "2030-06-30", "--priority", "High"]),
+        # Tasks created by the add-task runs have no assignees yet
+        ("assign-employee", lambda i: ["assign-employee", str(first_new_task + i), str(rng.randint(1, employees))]),
+        # Plans the whole unassigned backlog but writes nothing
+        ("auto-assign --dry-run", lambda i: ["auto-assign", "--dry-run"]),
+        ("view-workload", lambda i: ["view-workload", "--no-cache"]),
+        ("view-workload --sort tasks --top 10", lambda i: ["view-workload", "--sort", "tasks", "--top", "10", "--no-cache"]),
+        ("generate-report", lambda i: ["generate-report", "--no-cache"]),
+        # Project 1 is the largest under any skew
+        ("burndown (largest project)", lambda i: ["burndown", "1"]),
+        ("burndown --by week", lambda i: ["burndown", "--by", "week"]),
+        ("search (one match)", lambda i: ["search", f'"task {rng.randint(1, dataset["tasks"])}"']),
+        # Every task matches, so this is bound by ranking the whole table
+        ("search (all match) --limit 20", lambda i: ["search", "synthetic", "--limit", "20"]),
+        # Nothing is written after this point, so every run after the first is a hit
+        ("view-workload (cached)", lambda i: ["view-workload"]),
+        ("generate-report (cached)", lambda i: ["generate-report"]),
+    ]
+
+
+@click.command()
+@click.option("--projects", default=100, show_default=True, help="Projects in the dataset")
+@click.option("--tasks", default=100000, show_default=True, help="Tasks in the dataset")
+@click.option("--employees", default=1000, show_default=True, help="Employees in the dataset")
+@click.option("--assignments", default=1.5, show_default=True, help="Approximate mean assignees per task")
+@click.option("--skew", default=0.8, show_default=True, help="Zipf exponent for project sizes and employee load (0 = uniform)")
+@click.option("--seed", default=42, show_default=True, help="Random seed for the dataset and command arguments")
+@click.option("--runs", type=click.IntRange(min=1), default=20, show_default=True, help="Timed runs per command")
+@click.option("--sqlite-profile", type=click.Choice(SQLITE_PROFILES), help="SQLite pragma profile to benchmark")
+@click.option("--only", multiple=True, help="Only benchmark commands starting with this name (repeatable)")
+@click.option("--output", "-o", type=click.File("w"), default="-", help="Write the JSON report here (default: stdout)")
+@click.option("--keep", is_flag=True, help="Keep the scratch database instead of deleting it")
+def main(projects, tasks, employees, assignments, skew, seed, runs, sqlite_profile, only, output, keep):
+    """Generate a dataset and benchmark every CLI command against it"""
+    if sqlite_profile:
+        use_sqlite_profile(sqlite_profile)
+    scratch.remove()
+    Base.metadata.create_all(engine)
+    try:
+        click.echo(f"Generating dataset in {scratch.PATH} ...", err=True)
+        dataset = datagen.generate(engine, projects=projects, tasks=tasks, employees=employees,
+                                   assignments=assignments, skew=skew, seed=seed)
+        runner = CliRunner()
+        results = {}
+        for name, args_for_run in command_plan(dataset, seed):
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            click.echo(f"Benchmarking {name} ...", err=True)
+            results[name] = CommandBench(runner, name, args_for_run).run(runs)
+        report = {
+            "environment": {
+                "python": platform.python_version(),
+                "sqlite": sqlite3.sqlite_version,
+                "platform": platform.platform(),
+                "sqlite_profile": database.SQLITE_PROFILE,
+            },
+            "dataset": dataset,
+            "commands": results,
+        }
+        json.dump(report, output, indent=2)
+        output.write("\n")
+    finally:
+        engine.dispose()
+        if keep:
+            click.echo(f"Scratch database kept at {scratch.PATH}", err=True)
+        else:
+            scratch.remove()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
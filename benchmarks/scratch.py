@@ -0,0 +1,18 @@
+"""Point the application at a scratch SQLite file.
+
+Import this before anything that imports database: the engine reads
+PM_DATABASE_URL once, at import time. PM_BENCH_DATABASE overrides the
+scratch file location, e.g. to benchmark on a particular disk.
+"""
+import glob
+import os
+import tempfile
+
+PATH = os.environ.get("PM_BENCH_DATABASE") or os.path.join(tempfile.mkdtemp(prefix="pm-bench-"), "bench.db")
+os.environ["PM_DATABASE_URL"] = f"sqlite:///{PATH}"
+
+
+def remove():
+    """Delete the scratch database along with its WAL and shm files"""
+    for path in glob.glob(PATH + "*"):
+        os.remove(path)
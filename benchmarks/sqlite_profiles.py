@@ -0,0 +1,84 @@
+"""Compare the SQLite pragma profiles on add-task and generate-report.
+
+    python -m benchmarks.sqlite_profiles
+    python -m benchmarks.sqlite_profiles --tasks 500000 --writes 1000 --json
+
+"legacy" is the configuration before pragma profiles existed: rollback
+journal (journal_mode=DELETE) with a full fsync on every commit.
+"""
+from benchmarks import scratch  # noqa: F401  must precede database imports
+
+import json
+import statistics
+import time
+import click
+from click.testing import CliRunner
+import database
+from database import Base, engine, PRAGMA_PROFILES, use_sqlite_profile
+from benchmarks import datagen
+from main import cli
+
+PRAGMA_PROFILES.setdefault("legacy", {"journal_mode": "DELETE", "synchronous": "FULL"})
+PROFILES = ["legacy", "safe", "fast", "bulk"]
+
+
+def reset_database(profile, tasks, employees, projects):
+    """Recreate the scratch database under a profile and fill it"""
+    engine.dispose()
+    scratch.remove()
+    use_sqlite_profile(profile)
+    Base.metadata.create_all(engine)
+    datagen.generate(engine, projects=projects, tasks=tasks, employees=employees)
+
+
+def timed(runner, args, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = runner.invoke(cli, args)
+        timings.append((time.perf_counter() - started) * 1000)
+        if result.exit_code != 0 or "Error" in result.output:
+            raise click.ClickException(f"{' '.join(args)} failed: {result.output.strip()}")
+    return timings
+
+
+def summarize(timings):
+    timings = sorted(timings)
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+    }
+
+
+@click.command()
+@click.option("--tasks", default=200000, show_default=True, help="Tasks in the dataset")
+@click.option("--employees", default=2000, show_default=True, help="Employees in the dataset")
+@click.option("--projects", default=200, show_default=True, help="Projects in the dataset")
+@click.option("--writes", default=300, show_default=True, help="add-task invocations per profile")
+@click.option("--reports", default=5, show_default=True, help="generate-report invocations per profile")
+@click.option("--json", "as_json", is_flag=True, help="Print results as JSON")
+def main(tasks, employees, projects, writes, reports, as_json):
+    """Time add-task and generate-report under every pragma profile"""
+    runner = CliRunner()
+    results = {}
+    for profile in PROFILES:
+        reset_database(profile, tasks, employees, projects)
+        results[profile] = {
+            "add-task": summarize(timed(runner, ["add-task", "1", "Bench", "Benchmark task"], writes)),
+            "generate-report": summarize(timed(runner, ["generate-report"], reports)),
+        }
+    engine.dispose()
+    scratch.remove()
+    if as_json:
+        click.echo(json.dumps({"database": database.DATABASE_URL, "tasks": tasks, "results": results}, indent=2))
+        return
+    click.echo(f"{'profile':8} {'add-task median':>16} {'p95':>9} {'generate-report median':>23}")
+    for profile, result in results.items():
+        click.echo(
+            f"{profile:8} {result['add-task']['median_ms']:13.2f} ms {result['add-task']['p95_ms']:6.2f} ms"
+            f" {result['generate-report']['median_ms']:20.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""burndown: tasks created, completed and remaining per day or week."""
+from datetime import datetime, timedelta
+from itertools import groupby
+from operator import itemgetter
+import click
+from database import sessionLocal
+from queries import burndown_query
+from deadlines import format_day
+
+
+def period_start(day, period):
+    """The day itself, or the Monday starting its week"""
+    return day - timedelta(days=day.weekday()) if period == 'week' else day
+
+
+def burndown_series(rows, step, first=None, last=None):
+    """One project's burndown rows with the periods without activity filled
+    in, carrying the remaining count over, kept between first and last.
+
+    Yields (period start, created, completed, remaining).
+    """
+    remaining, cursor = 0, first
+    for _, _, period, created, completed, total in rows:
+        day = datetime.strptime(period, '%Y-%m-%d')
+        if last is not None and day > last:
+            break
+        if cursor is not None:
+            while cursor < day:
+                yield cursor, 0, 0, remaining
+                cursor += step
+        if first is None or day >= first:
+            yield day, created, completed, total
+        remaining = total
+        cursor = day + step if cursor is None else max(cursor, day + step)
+    if last is not None and cursor is not None:
+        while cursor <= last:
+            yield cursor, 0, 0, remaining
+            cursor += step
+
+
+def show_burndown(project_id, period, start, end):
+    """Body of burndown"""
+    step = timedelta(days=7 if period == 'week' else 1)
+    first = period_start(start, period) if start else None
+    last = period_start(end, period) if end else None
+    session = sessionLocal()
+    try:
+        rows = session.execute(burndown_query(project_id, period))
+        shown = False
+        for (proj_id, name), project_rows in groupby(rows, key=itemgetter(0, 1)):
+            click.echo(f"Project {name} (ID: {proj_id}), by {period}:")
+            periods = completed_total = 0
+            for day, created, completed, remaining in burndown_series(project_rows, step, first, last):
+                label = f"Week of {format_day(day)}" if period == 'week' else format_day(day)
+                click.echo(f"  {label}: {created} created, {completed} completed, {remaining} remaining")
+                periods += 1
+                completed_total += completed
+            if periods:
+                click.echo(f"  Velocity: {completed_total / periods:.1f} tasks completed per {period} over {periods} {period}s")
+            shown = True
+        if not shown:
+            click.echo("No tasks found." if project_id is None else f"No tasks found in project {project_id}.")
+    except Exception as e:
+        click.echo(f"Error computing burndown: {e}")
+    finally:
+        session.close()
@@ -0,0 +1,158 @@
+"""Verify with EXPLAIN QUERY PLAN that the CLI's queries use their indexes.
+
+Runs against a fresh in-memory schema built from models.py by default, or
+against an existing (migrated) database with --database:
+
+    python check_query_plans.py
+    python check_query_plans.py --database sqlite:///project_management.db
+"""
+import sys
+import click
+from sqlalchemy import create_engine, select
+from database import Base
+from models import Task, Employee, employee_task
+from queries import (
+    workload_query, task_totals_query, task_selection, set_completion_statement,
+    task_search_query, project_search_query, page_query, list_tasks_query, list_employees_query,
+    list_projects_query, TASK_ORDERINGS, EMPLOYEE_ORDERINGS, PROJECT_ORDERINGS,
+    open_window_clauses, window_tasks_query, window_count_query, window_groups_query,
+    project_graph_query, reaches_query, unassigned_tasks_query, open_load_query, burndown_query,
+    project_totals_query, project_employee_report_query,
+)
+from datetime import datetime
+
+# (command, query, builder, index the plan must mention)
+CHECKS = [
+    ("view-workload", "--sort tasks --top",
+     lambda: workload_query(sort='tasks', top=10),
+     "ix_employees_task_count"),
+    ("generate-report", "task totals",
+     task_totals_query,
+     "INTEGER PRIMARY KEY"),
+    ("generate-report", "--as-of task states",
+     lambda: task_totals_query(as_of=datetime(2030, 1, 1)),
+     "ix_task_events_task_occurred"),
+    ("generate-report", "--per-project projects of a range",
+     lambda: project_totals_query(1, 100),
+     "INTEGER PRIMARY KEY (rowid>? AND rowid<?)"),
+    ("generate-report", "--per-project employees of a range",
+     lambda: project_employee_report_query(1, 100),
+     "ix_tasks_project_completed_deadline (project_id>? AND project_id<?)"),
+    ("view-workload", "--as-of assignments",
+     lambda: workload_query(sort='tasks', top=10, as_of=datetime(2030, 1, 1)),
+     "ix_task_events_task_occurred"),
+    ("*", "Task.employees lazy load",
+     lambda: select(Employee).join(employee_task).where(employee_task.c.task_id == 1),
+     "ix_employee_task_task_id"),
+    ("*", "Project.tasks lazy load",
+     lambda: select(Task).where(Task.project_id == 1),
+     "ix_tasks_project_completed_deadline"),
+    ("complete-task", "--project",
+     lambda: set_completion_statement(task_selection(project_id=1), True),
+     "ix_tasks_project_completed_deadline"),
+    ("complete-task", "--assignee",
+     lambda: set_completion_statement(task_selection(assignee_id=1), True),
+     "sqlite_autoindex_employee_task_1"),
+    ("*", "tasks by deadline",
+     lambda: select(Task.id).where(Task.deadline < '2030-01-01').order_by(Task.deadline),
+     "ix_tasks_deadline"),
+    ("*", "open tasks by deadline",
+     lambda: select(Task.id).where(Task.completed == False, Task.deadline < '2030-01-01').order_by(Task.deadline),
+     "ix_tasks_open_deadline"),
+    ("*", "open tasks of a project by deadline",
+     lambda: select(Task.id).where(Task.completed == False, Task.project_id == 1).order_by(Task.deadline),
+     "ix_tasks_project_completed_deadline"),
+    ("list-tasks", "--sort deadline --after",
+     lambda: page_query(list_tasks_query(), TASK_ORDERINGS['deadline'], [datetime(2030, 1, 1), 10]),
+     "ix_tasks_deadline (deadline>?)"),
+    ("list-tasks", "--sort deadline --after (NULL deadline)",
+     lambda: page_query(list_tasks_query(), TASK_ORDERINGS['deadline'], [None, 10]),
+     "ix_tasks_deadline"),
+    ("list-tasks", "--project --open --sort deadline --after",
+     lambda: page_query(list_tasks_query(project_id=1, completed=False), TASK_ORDERINGS['deadline'], [datetime(2030, 1, 1), 10]),
+     "ix_tasks_project_completed_deadline (project_id=? AND completed=? AND deadline>?)"),
+    ("list-tasks", "--after",
+     lambda: page_query(list_tasks_query(), TASK_ORDERINGS['id'], [10]),
+     "INTEGER PRIMARY KEY (rowid>?)"),
+    ("list-tasks", "--sort priority --open --after",
+     lambda: page_query(list_tasks_query(completed=False), TASK_ORDERINGS['priority'], [2, datetime(2030, 1, 1), 10]),
+     "ix_tasks_priority_deadline (priority=? AND deadline>?)"),
+    ("list-employees", "--sort tasks --after",
+     lambda: page_query(list_employees_query(), EMPLOYEE_ORDERINGS['tasks'], [5, 10]),
+     "ix_employees_task_count (task_count<?)"),
+    ("list-projects", "--sort name --after",
+     lambda: page_query(list_projects_query(), PROJECT_ORDERINGS['name'], ['Project 5', 5]),
+     "ix_projects_name (name>?)"),
+    ("due", "tasks in the window",
+     lambda: window_tasks_query(open_window_clauses(datetime(2030, 1, 1), datetime(2030, 1, 8)), 50),
+     "ix_tasks_open_deadline (deadline>? AND deadline<?)"),
+    ("due", "window count",
+     lambda: window_count_query(open_window_clauses(datetime(2030, 1, 1), datetime(2030, 1, 8))),
+     "ix_tasks_open_deadline (deadline>? AND deadline<?)"),
+    ("overdue", "--group-by assignee",
+     lambda: window_groups_query(open_window_clauses(end=datetime(2030, 1, 1)), 'assignee', 50),
+     "ix_tasks_open_deadline (deadline<?)"),
+    ("overdue", "--project",
+     lambda: window_tasks_query(open_window_clauses(end=datetime(2030, 1, 1), project_id=1), 50),
+     "ix_tasks_project_completed_deadline (project_id=? AND completed=? AND deadline<?)"),
+    ("search", "tasks --project --open",
+     lambda: task_search_query('report*', project_id=1, completed=False),
+     "VIRTUAL TABLE INDEX"),
+    ("search", "--in projects",
+     lambda: project_search_query('report*'),
+     "VIRTUAL TABLE INDEX"),
+    ("auto-assign", "unassigned open tasks",
+     unassigned_tasks_query,
+     "ix_employee_task_task_id (task_id=?)"),
+    ("auto-assign", "open work per employee",
+     open_load_query,
+     "sqlite_autoindex_employee_task_1 (employee_id=?)"),
+    ("burndown", "tasks created per day",
+     lambda: burndown_query(1),
+     "ix_tasks_project_created_day (project_id=?)"),
+    ("burndown", "tasks completed per day",
+     lambda: burndown_query(1),
+     "ix_tasks_project_completed_day (project_id=?)"),
+    ("critical-path", "prerequisites of each task",
+     lambda: project_graph_query(1),
+     "sqlite_autoindex_task_dependencies_1 (task_id=?)"),
+    ("add-dependency", "cycle check",
+     lambda: reaches_query([Task.id.in_([1, 2])], 3),
+     "sqlite_autoindex_task_dependencies_1 (task_id=?)"),
+]
+
+
+def explain(conn, stmt):
+    """Return the EXPLAIN QUERY PLAN detail lines for a statement"""
+    sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql)]
+
+
+def run_checks(engine):
+    """Yield (check, plan lines, passed) for every entry in CHECKS"""
+    with engine.connect() as conn:
+        for check in CHECKS:
+            plan = explain(conn, check[2]())
+            yield check, plan, any(check[3] in line for line in plan)
+
+
+@click.command()
+@click.option('--database', help='Database URL to check instead of an in-memory schema')
+@click.option('--verbose', is_flag=True, help='Print the full plan of every query')
+def main(database, verbose):
+    """Check that each CLI command's queries are served by an index"""
+    engine = create_engine(database or "sqlite://")
+    if not database:
+        Base.metadata.create_all(engine)
+    failures = 0
+    for (command, name, _, index), plan, passed in run_checks(engine):
+        click.echo(f"{'ok  ' if passed else 'FAIL'} {command:16} {name} -> {index}")
+        if verbose or not passed:
+            for line in plan:
+                click.echo(f"       {line}")
+        failures += not passed
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
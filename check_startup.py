@@ -0,0 +1,97 @@
+"""Guard the CLI's startup cost.
+
+Runs `python -X importtime main.py --help` (and a usage error) in fresh
+interpreters, fails if any database/ORM module was imported, and fails if
+the median wall time exceeds a bare `import click` in the same
+interpreter by more than the budget:
+
+    python check_startup.py
+    python check_startup.py --budget-ms 20 --runs 20
+"""
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+import time
+import click
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that must only load once a command actually runs
+FORBIDDEN = ['sqlalchemy', 'database', 'models', 'queries', 'importer', 'exporter', 'profiling', 'shell', 'benchmarks', 'report_cache', 'pagination', 'critical_path', 'scheduling', 'server', 'aiosqlite', 'journal', 'project_report', 'assignments', 'dependencies', 'burndown', 'deadlines', 'search']
+
+# Invocations that must stay cheap: help output and argument errors
+INVOCATIONS = [['--help'], ['add-task']]
+
+# Milliseconds main.py may add to `import click`, which alone is most of
+# the startup and depends on the interpreter and its bytecode cache.
+# Measured medians on a 1-CPU machine, bytecode cached:
+#   Python 3.8.18:  import click 63 ms, main.py --help 75 ms (+12)
+#   Python 3.11.7:  import click 62 ms, main.py --help 76 ms (+14)
+DEFAULT_BUDGET_MS = 25
+
+
+def run_main(args, importtime=False):
+    cmd = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['main.py'] + args
+    return subprocess.run(cmd, cwd=HERE, capture_output=True, text=True)
+
+
+def imported_modules(args):
+    """Return {module: cumulative import time in us} from -X importtime"""
+    modules = {}
+    for line in run_main(args, importtime=True).stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def medians_ms(runs):
+    """Median wall time of `import click` and of each invocation, the runs
+    interleaved so a slow patch of the machine hits all of them alike"""
+    commands = [[sys.executable, '-c', 'import click']]
+    commands += [[sys.executable, 'main.py'] + args for args in INVOCATIONS]
+    timings = [[] for _ in commands]
+    for _ in range(runs):
+        for cmd, times in zip(commands, timings):
+            started = time.perf_counter()
+            subprocess.run(cmd, cwd=HERE, capture_output=True)
+            times.append((time.perf_counter() - started) * 1000)
+    return [statistics.median(times) for times in timings]
+
+
+@click.command()
+@click.option('--budget-ms', type=float, default=DEFAULT_BUDGET_MS, show_default=True, help='Maximum median time main.py adds to `import click`')
+@click.option('--runs', type=click.IntRange(min=1), default=10, show_default=True, help='Timed runs per invocation')
+def main(budget_ms, runs):
+    """Check that --help and usage errors skip the database layer"""
+    # Time what every run after the first sees: bytecode already cached
+    compileall.compile_dir(HERE, maxlevels=0, quiet=1)
+    baseline, *elapsed = medians_ms(runs)
+    click.echo(f"     import click             {baseline:6.1f} ms")
+    failed = False
+    for args, elapsed_ms in zip(INVOCATIONS, elapsed):
+        label = 'main.py ' + ' '.join(args)
+        modules = imported_modules(args)
+        leaked = sorted(name for name in modules if name.split('.')[0] in FORBIDDEN)
+        added = elapsed_ms - baseline
+        over = added > budget_ms
+        click.echo(f"{'FAIL' if leaked or over else 'ok  '} {label:24} {elapsed_ms:6.1f} ms "
+                   f"(+{added:.1f} ms, budget +{budget_ms:.0f} ms)")
+        if leaked:
+            click.echo(f"       imports {', '.join(leaked[:5])}{' ...' if len(leaked) > 5 else ''}")
+        if leaked or over:
+            slowest = sorted(
+                ((cumulative, name) for name, cumulative in modules.items() if '.' not in name and name != 'click'),
+                reverse=True,
+            )[:5]
+            for cumulative, name in slowest:
+                click.echo(f"       {cumulative / 1000:6.1f} ms  {name}")
+        failed = failed or bool(leaked) or over
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
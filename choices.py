@@ -0,0 +1,64 @@
+"""Option choices shared by the CLI and the modules implementing it.
+
+Kept free of SQLAlchemy imports so commands.py can build the CLI (and
+answer --help) without loading the database layer.
+"""
+
+import enum
+
+
+class Priority(enum.IntEnum):
+    """Task priority, stored as its integer value (models.PriorityType)"""
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+
+    def __str__(self):
+        return self.name.title()
+
+    def __format__(self, spec):
+        return format(str(self), spec)
+
+    @classmethod
+    def parse(cls, value):
+        """Priority from a member, its value or its name in any case"""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, int):
+            return cls(value)
+        try:
+            return cls[value.strip().upper()]
+        except KeyError:
+            raise ValueError(f"invalid priority {value!r}")
+
+
+PRIORITIES = [str(priority) for priority in Priority]
+
+WORKLOAD_SORTS = ['id', 'name', 'tasks']
+
+IMPORT_KINDS = ['projects', 'tasks', 'employees']
+IMPORT_FORMATS = ['csv', 'jsonl']
+DEFAULT_BATCH_SIZE = 10000
+
+EXPORT_KINDS = ['projects', 'tasks', 'employees', 'assignments']
+EXPORT_FORMATS = ['csv', 'jsonl']
+
+SEARCH_SCOPES = ['tasks', 'projects']
+
+# Sort orders of the list commands, defined in queries.*_ORDERINGS
+PROJECT_SORTS = ['id', 'name', 'deadline']
+TASK_SORTS = ['id', 'deadline', 'priority']
+EMPLOYEE_SORTS = ['id', 'name', 'tasks']
+DEFAULT_PAGE_SIZE = 50
+
+# Groupings of the due and overdue commands
+DEADLINE_GROUPS = ['project', 'assignee']
+
+# Buckets of the burndown command
+BURNDOWN_PERIODS = ['day', 'week']
+
+# Connection pragma profiles, defined in database.PRAGMA_PROFILES
+SQLITE_PROFILES = ['safe', 'fast', 'bulk']
+
+# Default for $PM_DATABASE_URL, read by database.py and report_cache.py
+DEFAULT_DATABASE_URL = "sqlite:///project_management.db"
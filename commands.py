@@ -0,0 +1,567 @@
+import click
+from datetime import datetime, timedelta
+from idspec import ID_SPEC
+from choices import (
+    PRIORITIES, WORKLOAD_SORTS, IMPORT_KINDS, IMPORT_FORMATS, DEFAULT_BATCH_SIZE,
+    EXPORT_KINDS, EXPORT_FORMATS, SQLITE_PROFILES, SEARCH_SCOPES,
+    PROJECT_SORTS, TASK_SORTS, EMPLOYEE_SORTS, DEFAULT_PAGE_SIZE, DEADLINE_GROUPS, BURNDOWN_PERIODS,
+)
+
+# SQLAlchemy, the engine and the mappers are imported inside the commands
+# that need them, so --help and usage errors never pay for them. Longer
+# command bodies live in their own modules (assignments, burndown, ...),
+# imported when the command runs. The commands are here rather than in
+# main.py because a script is compiled on every start, an imported module
+# only when it changes. check_startup.py guards this.
+
+def get_session():
+    from database import sessionLocal
+    return sessionLocal()
+
+def queue_write(op, error, message, **record):
+    """Queue the write in the journal if PM_WRITE_JOURNAL is on; see journal.queue_write"""
+    from journal import queue_write
+    return queue_write(op, error, message, **record)
+
+@click.group()
+@click.option('--profile', is_flag=True, help='Print a SQL statement profile after the command')
+@click.option('--sqlite-profile', type=click.Choice(SQLITE_PROFILES), help='SQLite pragma profile (default: $PM_SQLITE_PROFILE or fast)')
+@click.pass_context
+def cli(ctx, profile, sqlite_profile):
+    """Project Management CLI"""
+    if sqlite_profile:
+        from database import use_sqlite_profile
+        use_sqlite_profile(sqlite_profile)
+    if profile:
+        from database import engine
+        from profiling import QueryProfiler
+        profiler = QueryProfiler(engine)
+        profiler.install()
+        ctx.call_on_close(profiler.report)
+
+@click.command()
+@click.argument('name')
+@click.option('--description', default="", help='Project description')
+@click.option('--deadline', type=str, help='Project deadline (YYYY-MM-DD)')
+def create_project(name, description, deadline):
+    """Create a new project"""
+    if queue_write('create-project', "Error creating project", f"Project '{name}' queued for the next flush.",
+                   name=name, description=description, deadline=deadline):
+        return
+    from models import Project
+    session = get_session()
+    try:
+        deadline_date = datetime.strptime(deadline, "%Y-%m-%d") if deadline else None
+        project = Project(name=name, description=description, deadline=deadline_date)
+        session.add(project)
+        session.commit()
+        click.echo(f"Project '{name}' created successfully!")
+    except Exception as e:
+        click.echo(f"Error creating project: {e}")
+    finally:
+        session.close()
+
+@click.command()
+@click.argument('project_id', type=int)
+@click.argument('title')
+@click.argument('description')
+@click.option('--deadline', type=str, help='Task deadline (YYYY-MM-DD)')
+@click.option('--priority', type=click.Choice(PRIORITIES), default='Medium', help='Task priority')
+@click.option('--duration', 'duration_days', type=click.IntRange(min=0), default=1, show_default=True, help='Days of work, for critical-path')
+def add_task(project_id, title, description, deadline, priority, duration_days):
+    """Add a new task to a project"""
+    if queue_write('add-task', "Error adding task", f"Task '{title}' queued for project {project_id}.",
+                   project_id=project_id, title=title, description=description, deadline=deadline,
+                   priority=priority, duration_days=duration_days):
+        return
+    from models import Task
+    session = get_session()
+    try:
+        deadline_date = datetime.strptime(deadline, "%Y-%m-%d") if deadline else None
+        task = Task(project_id=project_id, title=title, description=description, deadline=deadline_date,
+                    priority=priority, duration_days=duration_days)
+        session.add(task)
+        session.commit()
+        click.echo(f"Task '{title}' added to project {project_id}.")
+    except Exception as e:
+        click.echo(f"Error adding task: {e}")
+    finally:
+        session.close()
+
+@click.command()
+@click.argument('name')
+@click.argument('role')
+def add_employee(name, role):
+    """Add a new employee"""
+    if queue_write('add-employee', "Error adding employee", f"Employee '{name}' queued for the next flush.",
+                   name=name, role=role):
+        return
+    from models import Employee
+    session = get_session()
+    try:
+        employee = Employee(name=name, role=role)
+        session.add(employee)
+        session.commit()
+        click.echo(f"Employee '{name}' added successfully!")
+    except Exception as e:
+        click.echo(f"Error adding employee: {e}")
+    finally:
+        session.close()
+
+@click.command()
+@click.argument('task_ids', type=ID_SPEC)
+@click.argument('employee_ids', type=ID_SPEC)
+@click.option('--project', 'project_id', type=int, help="Only tasks of this project (TASK_IDS may then be 'all')")
+def assign_employee(task_ids, employee_ids, project_id):
+    """Assign employees to tasks
+
+    TASK_IDS and EMPLOYEE_IDS each take an id, a list with ranges such as
+    1,4,10-20, or 'all'. Every selected employee is assigned to every
+    selected task in a single INSERT; existing assignments are kept.
+    """
+    if queue_write('assign-employee', "Error assigning employee", "Assignment queued for the next flush.",
+                   task_ids=str(task_ids), employee_ids=str(employee_ids), project_id=project_id):
+        return
+    from assignments import assign_employees
+    assign_employees(task_ids, employee_ids, project_id)
+
+@click.command()
+@click.option('--project', 'project_id', type=int, help='Only tasks of this project')
+@click.option('--role', help='Only assign to employees with this role')
+@click.option('--dry-run', is_flag=True, help='Show the resulting balance without assigning anything')
+def auto_assign(project_id, role, dry_run):
+    """Assign every unassigned open task, balancing open work
+
+    Tasks go out most urgent first (priority, then deadline), each to the
+    employee with the fewest days of open work at that point. All
+    assignments are written with one bulk INSERT.
+    """
+    from assignments import auto_assign_tasks
+    auto_assign_tasks(project_id, role, dry_run)
+
+def task_filter_options(command):
+    """Selection arguments shared by the set-based task commands"""
+    command = click.option('--deadline-before', type=click.DateTime(formats=['%Y-%m-%d']), help='Only tasks due before this date (YYYY-MM-DD)')(command)
+    command = click.option('--assignee', 'assignee_id', type=int, help='Only tasks assigned to this employee')(command)
+    command = click.option('--project', 'project_id', type=int, help='Only tasks of this project')(command)
+    command = click.argument('task_ids', type=ID_SPEC, required=False)(command)
+    return command
+
+def set_task_completion(completed, task_ids, project_id, assignee_id, deadline_before):
+    action = "complete" if completed else "reopen"
+    if task_ids is None and project_id is None and assignee_id is None and deadline_before is None:
+        raise click.UsageError(f"Give TASK_IDS or at least one filter; use 'all' to {action} every task.")
+    if queue_write(f'{action}-task', f"Error trying to {action} tasks", f"{'Completion' if completed else 'Reopening'} of the selected tasks queued for the next flush.",
+                   task_ids=None if task_ids is None else str(task_ids), project_id=project_id,
+                   assignee_id=assignee_id,
+                   deadline_before=None if deadline_before is None else deadline_before.strftime("%Y-%m-%d")):
+        return
+    from queries import task_selection, set_completion_statement
+    session = get_session()
+    try:
+        clauses = task_selection(task_ids, project_id, assignee_id, deadline_before)
+        changed = session.execute(set_completion_statement(clauses, completed)).rowcount
+        session.commit()
+        click.echo(f"{'Completed' if completed else 'Reopened'} {changed} tasks.")
+    except Exception as e:
+        session.rollback()
+        click.echo(f"Error trying to {action} tasks: {e}")
+    finally:
+        session.close()
+
+@click.command()
+@task_filter_options
+def complete_task(task_ids, project_id, assignee_id, deadline_before):
+    """Mark tasks as completed
+
+    Select tasks by TASK_IDS (e.g. 5, 1,4,10-20 or all) and/or the filters;
+    all matching tasks are updated with a single UPDATE statement.
+    """
+    set_task_completion(True, task_ids, project_id, assignee_id, deadline_before)
+
+@click.command()
+@task_filter_options
+def reopen_task(task_ids, project_id, assignee_id, deadline_before):
+    """Mark completed tasks as not completed
+
+    Takes the same selection as complete-task.
+    """
+    set_task_completion(False, task_ids, project_id, assignee_id, deadline_before)
+
+@click.command()
+@click.option('--sort', type=click.Choice(WORKLOAD_SORTS), default='id', help='Order employees by id, name or task count')
+@click.option('--top', type=click.IntRange(min=1), help='Only show the first N employees')
+@click.option('--min-tasks', type=click.IntRange(min=0), help='Only show employees with at least N tasks')
+@click.option('--as-of', type=click.DateTime(), help='Workload at this moment (local time), from the task history')
+@click.option('--no-cache', is_flag=True, help='Always query the database, bypassing the report cache')
+def view_workload(sort, top, min_tasks, as_of, no_cache):
+    """View employee workload"""
+    def lines(session):
+        from queries import workload_query
+        rows = session.execute(workload_query(sort=sort, top=top, min_tasks=min_tasks, as_of=as_of))
+        for emp_id, name, tasks_count in rows:
+            yield f"Employee {name} (ID: {emp_id}) has {tasks_count} tasks."
+
+    from report_cache import run_report
+    params = {'sort': sort, 'top': top, 'min_tasks': min_tasks, 'as_of': as_of}
+    run_report('view-workload', params, lines, "Error viewing workload", no_cache)
+
+@click.command()
+@click.option('--as-of', type=click.DateTime(), help='Report on this moment (local time), from the task history')
+@click.option('--per-project', is_flag=True, help='Report each project and its employees instead of the totals')
+@click.option('--jobs', type=click.IntRange(min=1), help='With --per-project, render projects in N worker processes')
+@click.option('--no-cache', is_flag=True, help='Always query the database, bypassing the report cache')
+def generate_report(as_of, per_project, jobs, no_cache):
+    """Generate report on task completion and employee performance
+
+    --as-of takes a day (its start) or a day and time, e.g.
+    2025-03-01T17:30:00, and reports the tasks and assignments of that
+    moment as recorded in the task history.
+
+    --per-project reports every project in id order with each assigned
+    employee's completed/assigned tasks in it. --jobs N spreads the
+    projects over N processes, each reading the SQLite file on its own
+    read-only connection; the output does not depend on N.
+    """
+    if jobs is not None and not per_project:
+        raise click.UsageError("--jobs only applies to --per-project")
+    if per_project and as_of is not None:
+        raise click.UsageError("--per-project cannot be combined with --as-of")
+    from report_cache import run_report
+    if per_project:
+        import os
+        from choices import DEFAULT_DATABASE_URL
+        from report_cache import sqlite_path
+        path = sqlite_path(os.environ.get("PM_DATABASE_URL", DEFAULT_DATABASE_URL))
+        if path is None:
+            raise click.ClickException("--per-project needs a SQLite database file")
+
+        def lines(session):
+            from project_report import project_report
+            yield from project_report(path, jobs or 1)
+
+        # The output is the same for every --jobs, so it shares one cache entry
+        run_report('generate-report', {'as_of': None, 'per_project': True}, lines, "Error generating report", no_cache)
+        return
+
+    def lines(session):
+        from queries import task_totals_query, employee_report_query
+        total, completed = session.execute(task_totals_query(as_of)).one()
+        yield f"Total Tasks: {total}, Completed Tasks: {completed}"
+
+        for name, assigned_tasks, completed in session.execute(employee_report_query(as_of)):
+            yield f"Employee {name}: {completed}/{assigned_tasks} tasks completed."
+
+    run_report('generate-report', {'as_of': as_of}, lines, "Error generating report", no_cache)
+
+@click.command()
+@click.argument('project_id', type=int, required=False)
+@click.option('--by', 'period', type=click.Choice(BURNDOWN_PERIODS), default='day', show_default=True, help='Daily burndown or weekly velocity')
+@click.option('--from', 'start', type=click.DateTime(formats=['%Y-%m-%d']), help='First day shown')
+@click.option('--to', 'end', type=click.DateTime(formats=['%Y-%m-%d']), help='Last day shown (default: the last day with activity)')
+def burndown(project_id, period, start, end):
+    """Tasks created, completed and remaining over time
+
+    Shows PROJECT_ID, or every project in turn. Each line is a day, or with
+    --by week a week from Monday, whose completed count is the velocity.
+    Remaining counts every task created and not completed by the end of
+    the period, including those before --from. A reopened task counts as
+    never completed.
+    """
+    from burndown import show_burndown
+    show_burndown(project_id, period, start, end)
+
+@click.command()
+@click.argument('query')
+@click.option('--in', 'scope', type=click.Choice(SEARCH_SCOPES), default='tasks', show_default=True, help='What to search')
+@click.option('--project', 'project_id', type=int, help='Only tasks of this project')
+@click.option('--priority', type=click.Choice(PRIORITIES), help='Only tasks with this priority')
+@click.option('--completed/--open', default=None, help='Only completed or only open tasks')
+@click.option('--limit', type=click.IntRange(min=1), default=20, show_default=True, help='Maximum number of results')
+def search(query, scope, project_id, priority, completed, limit):
+    """Full-text search over task or project titles and descriptions
+
+    QUERY uses SQLite FTS5 syntax: all words must match, "a phrase" matches
+    the exact phrase, prefix* matches word prefixes, and OR / NOT combine
+    terms. Results are ranked by bm25, title matches first.
+    """
+    if scope == 'projects' and (project_id is not None or priority or completed is not None):
+        raise click.UsageError("--project, --priority and --completed/--open only apply to --in tasks.")
+    from search import show_search
+    show_search(query, scope, project_id, priority, completed, limit)
+
+def list_options(sorts):
+    """Sort and keyset pagination options shared by the list commands"""
+    def decorate(command):
+        command = click.option('--limit', type=click.IntRange(min=1), default=DEFAULT_PAGE_SIZE, show_default=True, help='Rows per page')(command)
+        command = click.option('--after', metavar='CURSOR', help='Continue after the page that printed this cursor')(command)
+        command = click.option('--sort', type=click.Choice(sorts), default='id', show_default=True, help='Sort order')(command)
+        return command
+    return decorate
+
+@click.command()
+@list_options(PROJECT_SORTS)
+@click.option('--deadline-from', type=click.DateTime(formats=['%Y-%m-%d']), help='Deadline on or after (YYYY-MM-DD)')
+@click.option('--deadline-to', type=click.DateTime(formats=['%Y-%m-%d']), help='Deadline on or before (YYYY-MM-DD)')
+def list_projects(sort, after, limit, deadline_from, deadline_to):
+    """List projects a page at a time
+
+    Pass the cursor printed after a full page to --after to get the next
+    one; every page costs the same however deep it is.
+    """
+    from queries import PROJECT_ORDERINGS, list_projects_query
+    from pagination import list_page
+    from deadlines import format_day
+    list_page(
+        PROJECT_ORDERINGS, sort, after, limit,
+        lambda: list_projects_query(deadline_from, deadline_to),
+        lambda p: f"Project {p.name} (ID: {p.id}), deadline {format_day(p.deadline)}, "
+                  f"{p.completed_count}/{p.task_count} tasks completed.",
+        "Error listing projects",
+    )
+
+@click.command()
+@list_options(TASK_SORTS)
+@click.option('--project', 'project_id', type=int, help='Only tasks of this project')
+@click.option('--assignee', 'assignee_id', type=int, help='Only tasks assigned to this employee')
+@click.option('--priority', type=click.Choice(PRIORITIES), help='Only tasks with this priority')
+@click.option('--completed/--open', default=None, help='Only completed or only open tasks')
+@click.option('--deadline-from', type=click.DateTime(formats=['%Y-%m-%d']), help='Deadline on or after (YYYY-MM-DD)')
+@click.option('--deadline-to', type=click.DateTime(formats=['%Y-%m-%d']), help='Deadline on or before (YYYY-MM-DD)')
+def list_tasks(sort, after, limit, project_id, assignee_id, priority, completed, deadline_from, deadline_to):
+    """List tasks a page at a time
+
+    Tasks without a deadline sort first with --sort deadline. Pass the
+    cursor printed after a full page to --after to get the next one.
+    """
+    from queries import TASK_ORDERINGS, list_tasks_query
+    from pagination import list_page
+    from deadlines import format_day
+    list_page(
+        TASK_ORDERINGS, sort, after, limit,
+        lambda: list_tasks_query(project_id, assignee_id, priority, completed, deadline_from, deadline_to),
+        lambda t: f"Task {t.title} (ID: {t.id}), project {t.project_id}, {t.priority}, "
+                  f"due {format_day(t.deadline)}, {'completed' if t.completed else 'open'}",
+        "Error listing tasks",
+    )
+
+@click.command()
+@list_options(EMPLOYEE_SORTS)
+@click.option('--role', help='Only employees with this role')
+def list_employees(sort, after, limit, role):
+    """List employees a page at a time
+
+    --sort tasks puts the busiest employees first. Pass the cursor printed
+    after a full page to --after to get the next one.
+    """
+    from queries import EMPLOYEE_ORDERINGS, list_employees_query
+    from pagination import list_page
+    list_page(
+        EMPLOYEE_ORDERINGS, sort, after, limit,
+        lambda: list_employees_query(role),
+        lambda e: f"Employee {e.name} (ID: {e.id}), {e.role or 'no role'}, "
+                  f"{e.completed_count}/{e.task_count} tasks completed.",
+        "Error listing employees",
+    )
+
+def deadline_window_options(command):
+    """Options shared by due and overdue"""
+    command = click.option('--limit', type=click.IntRange(min=1), default=DEFAULT_PAGE_SIZE, show_default=True, help='Maximum tasks (or groups) to show')(command)
+    command = click.option('--group-by', type=click.Choice(DEADLINE_GROUPS), help='Summarize per project or per assignee')(command)
+    command = click.option('--project', 'project_id', type=int, help='Only tasks of this project')(command)
+    command = click.option('--as-of', type=click.DateTime(formats=['%Y-%m-%d']), help='Reference day (default: today)')(command)
+    return command
+
+@click.command()
+@deadline_window_options
+@click.option('--days', type=click.IntRange(min=1), default=7, show_default=True, help='Size of the window in days, counting the reference day')
+def due(as_of, project_id, group_by, limit, days):
+    """Open tasks due within the next --days days"""
+    from deadlines import format_day, show_deadline_window
+    start = as_of or datetime.combine(datetime.now().date(), datetime.min.time())
+    end = start + timedelta(days=days)
+    label = f"due {format_day(start)} to {format_day(end - timedelta(days=1))}"
+    show_deadline_window(label, start, end, project_id, group_by, limit)
+
+@click.command()
+@deadline_window_options
+def overdue(as_of, project_id, group_by, limit):
+    """Open tasks whose deadline is before today (or --as-of)"""
+    from deadlines import format_day, show_deadline_window
+    end = as_of or datetime.combine(datetime.now().date(), datetime.min.time())
+    show_deadline_window(f"overdue as of {format_day(end)}", None, end, project_id, group_by, limit)
+
+@click.command()
+def rebuild_counters():
+    """Recompute the materialized task counters from scratch
+
+    The counters are kept current by triggers; this is only needed after
+    writes that bypassed them. Runs in a single transaction.
+    """
+    from queries import rebuild_counter_statements
+    session = get_session()
+    try:
+        for stmt in rebuild_counter_statements():
+            session.execute(stmt)
+        session.commit()
+        click.echo("Task counters rebuilt.")
+    except Exception as e:
+        session.rollback()
+        click.echo(f"Error rebuilding counters: {e}")
+    finally:
+        session.close()
+
+@click.command()
+@click.argument('task_id', type=int)
+@click.argument('depends_on_ids', type=ID_SPEC)
+def add_dependency(task_id, depends_on_ids):
+    """Make a task wait for other tasks of its project
+
+    DEPENDS_ON_IDS takes an id or a list with ranges such as 1,4,10-20.
+    Dependencies that would close a cycle are refused; existing ones are
+    kept.
+    """
+    if depends_on_ids.everything:
+        raise click.UsageError("DEPENDS_ON_IDS must list task ids, not 'all'.")
+    from dependencies import add_dependencies
+    add_dependencies(task_id, depends_on_ids)
+
+@click.command()
+@click.argument('project_id', type=int)
+@click.option('--all', 'show_all', is_flag=True, help='Show the schedule of every task, not only the critical path')
+def critical_path(project_id, show_all):
+    """Schedule a project's tasks and show its critical path
+
+    Every task starts as soon as its prerequisites finish. Days count from
+    the project start; slack is how many days a task can slip without
+    delaying the project, and tasks on the critical path have none.
+    """
+    from dependencies import show_critical_path
+    show_critical_path(project_id, show_all)
+
+@click.command(name='import')
+@click.argument('kind', type=click.Choice(IMPORT_KINDS))
+@click.argument('source', type=click.Path(exists=True, dir_okay=False, allow_dash=True))
+@click.option('--format', 'fmt', type=click.Choice(IMPORT_FORMATS), help='Input format (default: from the file extension)')
+@click.option('--batch-size', type=click.IntRange(min=1), default=DEFAULT_BATCH_SIZE, show_default=True, help='Rows per INSERT batch')
+@click.option('--skip-invalid', is_flag=True, help='Skip rows that fail validation instead of aborting')
+def import_data(kind, source, fmt, batch_size, skip_invalid):
+    """Bulk import projects, tasks or employees from CSV or JSONL
+
+    Tasks reference their project with a 'project_id' or 'project' (name)
+    column and may list assignees in 'employees' as ids or names separated
+    by ';'. All rows are inserted in a single transaction.
+    """
+    from importer import run_import
+    run_import(kind, source, fmt, batch_size, skip_invalid)
+
+@click.command(name='export')
+@click.argument('kind', type=click.Choice(EXPORT_KINDS))
+@click.option('--format', 'fmt', type=click.Choice(EXPORT_FORMATS), default='csv', show_default=True, help='Output format')
+@click.option('--output', '-o', default='-', type=click.Path(dir_okay=False, writable=True, allow_dash=True), help='Output file (default: stdout)')
+@click.option('--project', 'project_id', type=int, help='Only rows belonging to this project')
+@click.option('--completed/--open', default=None, help='Only completed or only open tasks')
+@click.option('--deadline-from', type=click.DateTime(formats=['%Y-%m-%d']), help='Deadline on or after (YYYY-MM-DD)')
+@click.option('--deadline-to', type=click.DateTime(formats=['%Y-%m-%d']), help='Deadline on or before (YYYY-MM-DD)')
+def export_data(kind, fmt, output, project_id, completed, deadline_from, deadline_to):
+    """Stream projects, tasks, employees or assignments to CSV or JSONL
+
+    Filters select tasks and assignments by their task, and employees
+    assigned to at least one matching task.
+    """
+    if kind == 'projects' and completed is not None:
+        raise click.UsageError("--completed/--open does not apply to projects.")
+    from exporter import run_export
+    run_export(kind, fmt, output, project_id, completed, deadline_from, deadline_to)
+
+@click.command(context_settings={"ignore_unknown_options": True}, add_help_option=False)
+@click.argument('args', nargs=-1, type=click.UNPROCESSED)
+def bench(args):
+    """Benchmark every command on a synthetic dataset (see bench --help)"""
+    import subprocess
+    import sys
+    # A separate interpreter so the benchmark's scratch database never
+    # shares an engine with the one this process is configured for
+    sys.exit(subprocess.call([sys.executable, '-m', 'benchmarks', *args]))
+
+def warm_up():
+    """Configure the mappers and open a pooled connection ahead of time"""
+    from sqlalchemy.orm import configure_mappers
+    from database import engine
+    import models  # noqa: F401
+    configure_mappers()
+    engine.connect().close()
+
+@click.command()
+def flush():
+    """Apply the writes queued in the write journal
+
+    Records go into the database in transactions of many records each,
+    together with how far the journal is applied, so an interrupted flush
+    resumes where it stopped. Works whether or not PM_WRITE_JOURNAL is
+    still on.
+    """
+    from journal import run_flush
+    run_flush()
+
+@click.command()
+@click.option('--host', default='127.0.0.1', show_default=True, help='Interface to listen on')
+@click.option('--port', type=click.IntRange(min=0, max=65535), default=8080, show_default=True, help='TCP port (0 picks a free one)')
+@click.option('--pool-size', type=click.IntRange(min=1), default=5, show_default=True, help='Database connections shared by all requests')
+def serve(host, port, pool_size):
+    """Serve the project commands as an HTTP/JSON API
+
+    Needs the aiosqlite package. See server.py for the endpoints.
+    """
+    try:
+        import aiosqlite  # noqa: F401
+    except ImportError:
+        raise click.ClickException("serve needs the aiosqlite package: pip install aiosqlite")
+    from server import run_server
+    run_server(host, port, pool_size)
+
+@click.command()
+def shell():
+    """Interactive shell running commands in one long-lived process
+
+    With PM_WRITE_JOURNAL on, queued writes are applied in the background
+    every second and when the shell exits.
+    """
+    from shell import run_shell
+    from journal import Journal, Flusher
+    journal = Journal.open()
+    flusher = Flusher(journal, get_session) if journal else None
+    if flusher:
+        flusher.start()
+    try:
+        run_shell(cli, warm_up=warm_up)
+    finally:
+        if flusher:
+            flusher.stop()
+
+# Add commands to CLI
+cli.add_command(create_project)
+cli.add_command(add_task)
+cli.add_command(add_employee)  # Now properly added
+cli.add_command(list_projects)
+cli.add_command(list_tasks)
+cli.add_command(due)
+cli.add_command(overdue)
+cli.add_command(list_employees)
+cli.add_command(assign_employee)
+cli.add_command(auto_assign)
+cli.add_command(complete_task)
+cli.add_command(reopen_task)
+cli.add_command(view_workload)
+cli.add_command(generate_report)
+cli.add_command(burndown)
+cli.add_command(add_dependency)
+cli.add_command(critical_path)
+cli.add_command(rebuild_counters)
+cli.add_command(flush)
+cli.add_command(search)
+cli.add_command(import_data)
+cli.add_command(export_data)
+cli.add_command(serve)
+cli.add_command(shell)
+cli.add_command(bench)
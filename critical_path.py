@@ -0,0 +1,150 @@
+"""Critical path method over a project's task dependency graph.
+
+Tasks are numbered 0..n-1 on load and the graph is kept as lists of
+successor indexes, so both passes are plain list walks: Kahn's algorithm
+orders the tasks and computes the earliest start of each in one forward
+pass, and one backward pass over that order gives the latest start. Both
+are O(tasks + dependencies). Times are whole days from the project start.
+"""
+
+
+class CycleError(ValueError):
+    """The dependencies contain a cycle; cycle lists its task ids in order,
+    each one a prerequisite of the next, ending where it started"""
+
+    def __init__(self, cycle):
+        super().__init__("dependency cycle: " + " -> ".join(str(task_id) for task_id in cycle))
+        self.cycle = cycle
+
+
+class Schedule:
+    """Earliest and latest start of every task, and one critical path.
+
+    Lists are indexed by position in ids; order holds those positions in
+    dependency order. Finish times are start + duration.
+    """
+
+    def __init__(self, ids, durations, earliest, latest, order, dependencies):
+        self.ids = ids
+        self.durations = durations
+        self.earliest = earliest
+        self.latest = latest
+        self.order = order
+        self.dependencies = dependencies
+        self.length = max((start + duration for start, duration in zip(earliest, durations)), default=0)
+        self.path = []
+
+    def slack(self, position):
+        return self.latest[position] - self.earliest[position]
+
+
+def load_graph(rows):
+    """(ids, durations, successor lists, dependency count) from rows of
+    (task id, duration, comma-separated prerequisite ids or None).
+
+    Prerequisites outside the rows, e.g. in another project, are ignored.
+    """
+    rows = list(rows)
+    ids = [row[0] for row in rows]
+    durations = [row[1] for row in rows]
+    index = {task_id: position for position, task_id in enumerate(ids)}
+    successors = [[] for _ in ids]
+    count = 0
+    for position, (_, _, prerequisites) in enumerate(rows):
+        if not prerequisites:
+            continue
+        for depends_on_id in prerequisites.split(","):
+            prerequisite = index.get(int(depends_on_id))
+            if prerequisite is not None:
+                successors[prerequisite].append(position)
+                count += 1
+    return ids, durations, successors, count
+
+
+def find_cycle(ids, successors, done):
+    """The shortest cycle through one of the tasks Kahn's algorithm could
+    not order.
+
+    Every such task still has an unordered prerequisite, so walking
+    prerequisites from any of them comes back to a task on a cycle; a
+    breadth-first search from that task finds the shortest way back to it.
+    """
+    prerequisite = {}
+    for position, following in enumerate(successors):
+        if not done[position]:
+            for successor in following:
+                if not done[successor]:
+                    prerequisite[successor] = position
+    position = next(iter(prerequisite))
+    seen = set()
+    while position not in seen:
+        seen.add(position)
+        position = prerequisite[position]
+    start = position
+    parent = {start: None}
+    frontier = [start]
+    while frontier:
+        following = []
+        for position in frontier:
+            for successor in successors[position]:
+                if successor == start:
+                    cycle = [start]
+                    while position is not None:
+                        cycle.append(position)
+                        position = parent[position]
+                    return [ids[position] for position in cycle[::-1]]
+                if not done[successor] and successor not in parent:
+                    parent[successor] = position
+                    following.append(successor)
+        frontier = following
+
+
+def critical_path(rows):
+    """Schedule the tasks of rows (see load_graph) as early as possible.
+
+    Raises CycleError if the dependencies are not acyclic.
+    """
+    ids, durations, successors, count = load_graph(rows)
+    pending = [0] * len(ids)
+    for following in successors:
+        for successor in following:
+            pending[successor] += 1
+
+    # Forward pass: a task is ordered once all its prerequisites are, and
+    # starts when the last of them finishes
+    order = [position for position, waiting in enumerate(pending) if not waiting]
+    earliest = [0] * len(ids)
+    for position in order:
+        finish = earliest[position] + durations[position]
+        for successor in successors[position]:
+            if finish > earliest[successor]:
+                earliest[successor] = finish
+            pending[successor] -= 1
+            if not pending[successor]:
+                order.append(successor)
+    if len(order) < len(ids):
+        done = [False] * len(ids)
+        for position in order:
+            done[position] = True
+        raise CycleError(find_cycle(ids, successors, done))
+
+    # Backward pass: a task must finish by the latest start of every task
+    # waiting on it, or by the end of the project
+    schedule = Schedule(ids, durations, earliest, [0] * len(ids), order, count)
+    latest = schedule.latest
+    for position in reversed(order):
+        following = successors[position]
+        finish = min([latest[successor] for successor in following]) if following else schedule.length
+        latest[position] = finish - durations[position]
+
+    # A critical task with no slack always has a successor starting exactly
+    # when it finishes, unless it ends the project; follow those from the start
+    start = next((position for position in order if earliest[position] == 0 and not schedule.slack(position)), None)
+    while start is not None:
+        schedule.path.append(start)
+        finish = earliest[start] + durations[start]
+        start = next((
+            successor for successor in successors[start]
+            if earliest[successor] == finish and not schedule.slack(successor)
+        ), None)
+    return schedule
@@ -1,9 +1,82 @@
-from sqlalchemy import create_engine
+import os
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
+from choices import SQLITE_PROFILES, DEFAULT_DATABASE_URL
 
-DATABASE_URL="sqlite:///project_management.db"
+DATABASE_URL=os.environ.get("PM_DATABASE_URL", DEFAULT_DATABASE_URL)
 
-engine=create_engine(DATABASE_URL, echo=True)
+# Statement logging is noisy and slow on large reports, so it is opt-in
+SQL_ECHO=os.environ.get("PM_SQL_ECHO", "").lower() in ("1", "true", "yes", "on")
+
+# Pragmas applied to every new SQLite connection. WAL lets readers and the
+# writer proceed concurrently; the profiles differ in how much durability
+# they trade for speed:
+#   safe - fsync on every commit
+#   fast - fsync only at WAL checkpoints; a power loss may drop the last
+#          commits but never corrupts the database
+#   bulk - no fsync at all, for imports that can simply be re-run
+PRAGMA_PROFILES={
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -65536,        # 64 MiB
+        "mmap_size": 268435456,      # 256 MiB
+        "temp_store": "MEMORY",
+    },
+    "bulk": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "busy_timeout": 5000,
+        "cache_size": -262144,       # 256 MiB
+        "mmap_size": 1073741824,     # 1 GiB
+        "temp_store": "MEMORY",
+    },
+}
+assert set(PRAGMA_PROFILES) == set(SQLITE_PROFILES)
+
+SQLITE_PROFILE=os.environ.get("PM_SQLITE_PROFILE", "fast")
+if SQLITE_PROFILE not in PRAGMA_PROFILES:
+    raise ValueError(f"PM_SQLITE_PROFILE must be one of {', '.join(SQLITE_PROFILES)}, not {SQLITE_PROFILE!r}")
+
+engine=create_engine(DATABASE_URL, echo=SQL_ECHO)
 sessionLocal=sessionmaker(bind=engine)
 
-Base=declarative_base()
\ No newline at end of file
+Base=declarative_base()
+
+
+# Pragmas a read-only (mode=ro) connection may set; journal_mode=WAL is a
+# write unless the file is already in WAL mode
+READ_ONLY_PRAGMAS=("busy_timeout", "cache_size", "mmap_size", "temp_store")
+
+
+def set_sqlite_pragmas(dbapi_connection, read_only=False):
+    """Apply the current pragma profile to a new DBAPI connection; only
+    the READ_ONLY_PRAGMAS of it on a read-only one"""
+    cursor = dbapi_connection.cursor()
+    for pragma, value in PRAGMA_PROFILES[SQLITE_PROFILE].items():
+        if read_only and pragma not in READ_ONLY_PRAGMAS:
+            continue
+        cursor.execute(f"PRAGMA {pragma}={value}")
+    cursor.close()
+
+
+@event.listens_for(engine, "connect")
+def apply_pragmas(dbapi_connection, connection_record):
+    if engine.dialect.name != "sqlite":
+        return
+    set_sqlite_pragmas(dbapi_connection)
+
+
+def use_sqlite_profile(name):
+    """Switch pragma profile; pooled connections are reopened with it"""
+    global SQLITE_PROFILE
+    if name not in PRAGMA_PROFILES:
+        raise ValueError(f"unknown SQLite profile {name!r}")
+    SQLITE_PROFILE = name
+    engine.dispose()
@@ -0,0 +1,34 @@
+"""due and overdue: open tasks whose deadline falls in a window."""
+import click
+from database import sessionLocal
+from queries import open_window_clauses, window_tasks_query, window_count_query, window_groups_query
+
+
+def format_day(value):
+    return value.strftime('%Y-%m-%d') if value else 'none'
+
+
+def show_deadline_window(label, start, end, project_id, group_by, limit):
+    """Print the open tasks due in [start, end), listed or grouped"""
+    session = sessionLocal()
+    try:
+        clauses = open_window_clauses(start, end, project_id)
+        total = session.execute(window_count_query(clauses)).scalar()
+        click.echo(f"{total} open tasks {label}.")
+        if group_by:
+            for group_id, name, tasks, earliest in session.execute(window_groups_query(clauses, group_by, limit)):
+                if group_id is None:
+                    who = "Unassigned" if group_by == 'assignee' else "No project"
+                else:
+                    who = f"{'Project' if group_by == 'project' else 'Employee'} {name} (ID: {group_id})"
+                click.echo(f"{who}: {tasks} tasks, earliest due {format_day(earliest)}")
+            return
+        for task_id, title, deadline, priority, project in session.execute(window_tasks_query(clauses, limit)):
+            where = f" in {project}" if project else ""
+            click.echo(f"{format_day(deadline)}  Task {title} (ID: {task_id}){where}, {priority}")
+        if total > limit:
+            click.echo(f"... and {total - limit} more (raise --limit to see them).")
+    except Exception as e:
+        click.echo(f"Error listing tasks {label}: {e}")
+    finally:
+        session.close()
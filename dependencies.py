@@ -0,0 +1,76 @@
+"""add-dependency and critical-path: task_dependencies edges and the
+project schedule computed from them (see critical_path.py)."""
+import click
+from sqlalchemy import select
+from database import sessionLocal
+from models import Project, Task
+from queries import id_spec_clause, reaches_query, add_dependencies_statement, project_graph_query
+from idspec import describe_missing
+from assignments import find_existing
+from critical_path import critical_path, CycleError
+
+
+def add_dependencies(task_id, depends_on_ids):
+    """Body of add-dependency"""
+    session = sessionLocal()
+    try:
+        task = session.get(Task, task_id)
+        if task is None:
+            click.echo("Task not found.")
+            return
+        clauses = [id_spec_clause(Task.id, depends_on_ids), Task.project_id == task.project_id]
+        found, _, missing, missing_count = find_existing(session, Task.id, Task.title, clauses, depends_on_ids)
+        if missing:
+            click.echo(f"Tasks not found in project {task.project_id}: {describe_missing(missing, missing_count)}. "
+                       "Nothing was added.")
+            return
+        if task_id in depends_on_ids or session.execute(reaches_query(clauses, task_id)).scalar():
+            click.echo(f"Task {task_id} cannot depend on these tasks: it would form a dependency cycle. "
+                       "Nothing was added.")
+            return
+        inserted = session.execute(add_dependencies_statement(task_id, clauses)).rowcount
+        session.commit()
+        click.echo(f"Task '{task.title}' now depends on {found} tasks: "
+                   f"{inserted} new, {found - inserted} already existed.")
+    except Exception as e:
+        session.rollback()
+        click.echo(f"Error adding dependency: {e}")
+    finally:
+        session.close()
+
+
+def show_critical_path(project_id, show_all):
+    """Body of critical-path"""
+    session = sessionLocal()
+    try:
+        project = session.get(Project, project_id)
+        if project is None:
+            click.echo("Project not found.")
+            return
+        rows = session.execute(project_graph_query(project_id)).tuples()
+        try:
+            schedule = critical_path(rows)
+        except CycleError as e:
+            click.echo(f"Cannot schedule project '{project.name}': {e}")
+            return
+        titles = dict(session.execute(select(Task.id, Task.title).where(Task.project_id == project_id)).all())
+        click.echo(f"Project '{project.name}': {len(schedule.ids)} tasks, {schedule.dependencies} dependencies, "
+                   f"{schedule.length} days.")
+        if not schedule.ids:
+            return
+        click.echo(f"Critical path ({len(schedule.path)} tasks):")
+        for position in schedule.path:
+            start = schedule.earliest[position]
+            task_id = schedule.ids[position]
+            click.echo(f"  Day {start}-{start + schedule.durations[position]}: {titles[task_id]} (ID: {task_id})")
+        if show_all:
+            click.echo("All tasks, earliest start first:")
+            for position in sorted(schedule.order, key=lambda position: (schedule.earliest[position], schedule.ids[position])):
+                task_id, duration = schedule.ids[position], schedule.durations[position]
+                earliest, latest = schedule.earliest[position], schedule.latest[position]
+                click.echo(f"  {titles[task_id]} (ID: {task_id}): earliest {earliest}-{earliest + duration}, "
+                           f"latest {latest}-{latest + duration}, slack {latest - earliest}")
+    except Exception as e:
+        click.echo(f"Error computing critical path: {e}")
+    finally:
+        session.close()
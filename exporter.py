@@ -0,0 +1,134 @@
+import contextlib
+import csv
+import json
+import sys
+from sqlalchemy import select, case, type_coerce, Integer, String
+from models import Project, Task, Employee, employee_task
+from queries import deadline_filters
+from choices import Priority
+
+EXPORT_BATCH_SIZE = 5000
+
+
+def raw(column, type_=String):
+    """Select a column without its Python-side result processing.
+
+    DATETIME values stay as the stored ISO text and booleans as 0/1, which
+    is what gets written anyway and skips a conversion per value.
+    """
+    return type_coerce(column, type_).label(column.key)
+
+
+def priority_name(column):
+    """The stored priority value mapped back to its name inside SQL, so the
+    export stays readable and importable without a conversion per row"""
+    names = {int(priority): str(priority) for priority in Priority}
+    return case(names, value=type_coerce(column, Integer)).label(column.key)
+
+
+def task_filters(project_id=None, completed=None, deadline_from=None, deadline_to=None):
+    """WHERE clauses on Task for the export filters"""
+    clauses = []
+    if project_id is not None:
+        clauses.append(Task.project_id == project_id)
+    if completed is not None:
+        clauses.append(Task.completed == completed)
+    return clauses + deadline_filters(Task.deadline, deadline_from, deadline_to)
+
+
+def export_query(kind, project_id=None, completed=None, deadline_from=None, deadline_to=None):
+    """Build the column-only SELECT streamed by the export command.
+
+    Tasks and assignments are filtered on their task, employees on having
+    at least one assigned task that matches; projects take --project and
+    the deadline filters on their own columns.
+    """
+    if kind == 'projects':
+        stmt = select(Project.id, Project.name, Project.description, raw(Project.deadline))
+        if project_id is not None:
+            stmt = stmt.where(Project.id == project_id)
+        stmt = stmt.where(*deadline_filters(Project.deadline, deadline_from, deadline_to))
+        return stmt.order_by(Project.id)
+    clauses = task_filters(project_id, completed, deadline_from, deadline_to)
+    if kind == 'employees':
+        stmt = select(Employee.id, Employee.name, Employee.role)
+        if clauses:
+            assigned = select(employee_task.c.employee_id).join(Task, Task.id == employee_task.c.task_id)
+            stmt = stmt.where(Employee.id.in_(assigned.where(*clauses)))
+        return stmt.order_by(Employee.id)
+    if kind == 'tasks':
+        stmt = select(
+            Task.id, Task.project_id, Task.title, Task.description,
+            raw(Task.deadline), priority_name(Task.priority), raw(Task.completed, Integer), Task.duration_days,
+            raw(Task.created_at), raw(Task.completed_at),
+        )
+    else:
+        stmt = (
+            select(employee_task.c.employee_id, employee_task.c.task_id)
+            .join(Task, Task.id == employee_task.c.task_id)
+        )
+    stmt = stmt.where(*clauses)
+    if kind == 'tasks':
+        return stmt.order_by(Task.id)
+    return stmt.order_by(employee_task.c.task_id, employee_task.c.employee_id)
+
+
+def open_target(path):
+    """Open a path for writing, '-' meaning stdout (left open afterwards)"""
+    if path == '-':
+        return contextlib.nullcontext(sys.stdout)
+    return open(path, 'w', newline='', encoding='utf-8')
+
+
+def stream_export(session, stmt, fmt, out, batch_size=EXPORT_BATCH_SIZE):
+    """Write the query's rows to out batch by batch, returning the row count"""
+    # Executed on the Connection so rows skip the ORM loading layer
+    result = session.connection().execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+    keys = list(result.keys())
+    count = 0
+    if fmt == 'csv':
+        writer = csv.writer(out)
+        writer.writerow(keys)
+        for rows in result.partitions():
+            writer.writerows(rows)
+            count += len(rows)
+        return count
+    bools = [key == 'completed' for key in keys]
+    for rows in result.partitions():
+        out.writelines(
+            json.dumps({
+                key: (bool(value) if is_bool and value is not None else value)
+                for key, value, is_bool in zip(keys, row, bools)
+            }) + "\n"
+            for row in rows
+        )
+        count += len(rows)
+    return count
+
+
+def exit_on_broken_pipe():
+    """Stop quietly once the reader of stdout is gone (e.g. `| head`).
+    stdout is pointed at devnull so flushing it at exit cannot fail again."""
+    import os
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    sys.exit(0)
+
+
+def run_export(kind, fmt, output, project_id, completed, deadline_from, deadline_to):
+    """Body of export; the count goes to stderr so stdout stays pure data"""
+    import click
+    from database import sessionLocal
+    session = sessionLocal()
+    try:
+        stmt = export_query(kind, project_id=project_id, completed=completed,
+                            deadline_from=deadline_from, deadline_to=deadline_to)
+        with open_target(output) as out:
+            count = stream_export(session, stmt, fmt, out)
+        click.echo(f"Exported {count} {kind}.", err=True)
+    except BrokenPipeError:
+        exit_on_broken_pipe()
+    except Exception as e:
+        click.echo(f"Error exporting {kind}: {e}", err=True)
+    finally:
+        session.close()
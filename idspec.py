@@ -0,0 +1,116 @@
+"""Parsing of id list arguments such as "3", "1,4,7" or "10-20,25".
+
+Free of SQLAlchemy imports so commands can declare ID_SPEC parameters
+without slowing down --help; queries.id_spec_clause turns a spec into SQL.
+"""
+import click
+
+ALL = 'all'
+
+# Largest id SQLite can store (a signed 64-bit INTEGER)
+MAX_ID = 2 ** 63 - 1
+
+
+class IdSpec:
+    """A set of explicit ids plus inclusive ranges, or every row ('all').
+
+    Overlapping and adjacent ranges are merged and ids inside a range
+    dropped, so every id is named once and the parts can be counted
+    separately. Ranges are never expanded: 1-20000000 stays two numbers.
+    """
+
+    def __init__(self, ids=(), ranges=(), everything=False):
+        merged = []
+        for low, high in sorted(ranges):
+            if merged and low <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+            else:
+                merged.append((low, high))
+        self.ranges = merged
+        self.ids = sorted(i for i in set(ids) if not any(low <= i <= high for low, high in merged))
+        self.everything = everything
+
+    def parts(self):
+        """The ids of every range, as range objects, then the single ids as
+        a list; empty for 'all'"""
+        parts = [range(low, high + 1) for low, high in self.ranges]
+        if self.ids:
+            parts.append(self.ids)
+        return parts
+
+    def __contains__(self, i):
+        return self.everything or i in self.ids or any(low <= i <= high for low, high in self.ranges)
+
+    def size(self):
+        """How many ids the spec names, or None for 'all'"""
+        return None if self.everything else sum(len(part) for part in self.parts())
+
+    def __str__(self):
+        if self.everything:
+            return ALL
+        parts = [str(i) for i in self.ids] + [f"{low}-{high}" for low, high in self.ranges]
+        return ",".join(parts)
+
+
+def parse_id_spec(text):
+    text = text.strip()
+    if text.lower() == ALL:
+        return IdSpec(everything=True)
+    ids, ranges = [], []
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        low, sep, high = part.partition('-')
+        if not low.isdigit() or (sep and not high.isdigit()):
+            raise ValueError(f"'{part}' is not an id or an id range like 10-20")
+        if int(low) > MAX_ID or (sep and int(high) > MAX_ID):
+            raise ValueError(f"'{part}' is beyond the largest id {MAX_ID}")
+        if sep:
+            low, high = int(low), int(high)
+            if low > high:
+                raise ValueError(f"range '{part}' is reversed")
+            ranges.append((low, high))
+        else:
+            ids.append(int(low))
+    if not ids and not ranges:
+        raise ValueError("no ids given")
+    return IdSpec(ids, ranges)
+
+
+class IdSpecType(click.ParamType):
+    name = 'ids'
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, IdSpec):
+            return value
+        try:
+            return parse_id_spec(value)
+        except ValueError as e:
+            self.fail(str(e), param, ctx)
+
+
+ID_SPEC = IdSpecType()
+
+
+def gap_ids(gaps, low, high, missing, limit):
+    """The first limit ids missing from the range low-high, given the first
+    gaps [(first id, last id)] before its last existing id, in order, as
+    returned by queries.missing_ranges_query, and how many ids it misses.
+    Whatever the gaps do not account for is missing after the last one."""
+    ids = []
+    for first, last in gaps:
+        ids.extend(range(first, min(last, first + limit - len(ids) - 1) + 1))
+        if len(ids) == limit:
+            return ids
+    trailing = missing - sum(last - first + 1 for first, last in gaps)
+    return ids + list(range(high - trailing + 1, high + 1)[:limit - len(ids)])
+
+
+def describe_missing(missing, total=None, limit=10):
+    """Short human readable list of ids that were not found; total is the
+    number missing when missing only holds the first of them"""
+    missing = sorted(missing)
+    total = len(missing) if total is None else total
+    shown = ", ".join(str(i) for i in missing[:limit])
+    return shown + (f" and {total - limit} more" if total > limit else "")
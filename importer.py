@@ -0,0 +1,305 @@
+import contextlib
+import csv
+import functools
+import json
+import os
+import sys
+from datetime import datetime
+from sqlalchemy import insert, select, func
+from models import Project, Task, Employee, employee_task
+from choices import PRIORITIES, DEFAULT_BATCH_SIZE, Priority
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+FALSE_VALUES = {'', '0', 'false', 'no', 'n'}
+
+
+class RowError(ValueError):
+    """A row that failed validation, carrying its line number"""
+
+    def __init__(self, line, message):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+
+
+def detect_format(path):
+    """Guess the input format from the file extension, defaulting to csv"""
+    ext = os.path.splitext(path)[1].lower()
+    return 'jsonl' if ext in ('.jsonl', '.ndjson', '.json') else 'csv'
+
+
+def open_source(path):
+    """Open a path for reading, '-' meaning stdin (left open afterwards)"""
+    if path == '-':
+        return contextlib.nullcontext(sys.stdin)
+    return open(path, newline='', encoding='utf-8')
+
+
+def read_rows(stream, fmt):
+    """Yield (line number, dict) for every record of a CSV or JSONL stream"""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            raise RowError(line_no, f"invalid JSON ({e})")
+        if not isinstance(row, dict):
+            raise RowError(line_no, "expected a JSON object")
+        yield line_no, row
+
+
+def text_value(row, key):
+    value = row.get(key)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def required(row, key, line):
+    value = text_value(row, key)
+    if value is None:
+        raise RowError(line, f"'{key}' is required")
+    return value
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_day(text):
+    # Deadlines repeat heavily in bulk files, so parsed days are cached
+    if len(text) != 10:
+        raise ValueError(text)
+    return datetime.fromisoformat(text)
+
+
+def parse_date(value, line):
+    if value is None:
+        return None
+    try:
+        return parse_day(value[:10])
+    except ValueError:
+        raise RowError(line, f"invalid date '{value}' (expected YYYY-MM-DD)")
+
+
+def parse_timestamp(value, line):
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise RowError(line, f"invalid timestamp '{value}' (expected YYYY-MM-DD[ HH:MM[:SS]])")
+
+
+def parse_bool(value, line):
+    if isinstance(value, bool):
+        return value
+    text = '' if value is None else str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise RowError(line, f"invalid boolean '{value}'")
+
+
+def parse_priority(value, line):
+    """A name in any case or the stored value (1-3), as a plain int"""
+    if value is None:
+        return int(Priority.MEDIUM)
+    try:
+        return int(Priority.parse(int(value) if value.isdigit() else value))
+    except ValueError:
+        raise RowError(line, f"invalid priority '{value}' (expected one of {', '.join(PRIORITIES)})")
+
+
+def parse_duration(value, line):
+    if value is None:
+        return 1
+    if not value.isdigit():
+        raise RowError(line, f"invalid duration '{value}' (expected whole days)")
+    return int(value)
+
+
+class References:
+    """Resolves project and employee references given as ids or names.
+
+    Each lookup table is loaded with a single query the first time a row
+    needs it, so resolving a reference is a dict lookup afterwards.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self._maps = {}
+
+    def _load(self, model):
+        if model not in self._maps:
+            ids, names = set(), {}
+            for row_id, name in self.session.execute(select(model.id, model.name)):
+                ids.add(row_id)
+                # None marks a name shared by several rows
+                names[name] = None if name in names else row_id
+            self._maps[model] = (ids, names)
+        return self._maps[model]
+
+    def resolve(self, model, ref, line):
+        ids, names = self._load(model)
+        label = model.__tablename__[:-1]
+        if ref.isdigit() and int(ref) in ids:
+            return int(ref)
+        if ref in names:
+            if names[ref] is None:
+                raise RowError(line, f"{label} name '{ref}' is ambiguous, use its id")
+            return names[ref]
+        raise RowError(line, f"unknown {label} '{ref}'")
+
+
+def split_refs(value):
+    """Employee references come as a JSON list or a ';' separated string"""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(ref).strip() for ref in value if str(ref).strip()]
+    return [ref.strip() for ref in str(value).split(';') if ref.strip()]
+
+
+def project_row(row, line, refs):
+    return {
+        'name': required(row, 'name', line),
+        'description': text_value(row, 'description') or "",
+        'deadline': parse_date(text_value(row, 'deadline'), line),
+    }
+
+
+def employee_row(row, line, refs):
+    return {
+        'name': required(row, 'name', line),
+        'role': text_value(row, 'role'),
+    }
+
+
+def task_row(row, line, refs):
+    project_ref = text_value(row, 'project_id') or required(row, 'project', line)
+    task = {
+        'project_id': refs.resolve(Project, project_ref, line),
+        'title': required(row, 'title', line),
+        'description': text_value(row, 'description') or "",
+        'deadline': parse_date(text_value(row, 'deadline'), line),
+        'priority': parse_priority(text_value(row, 'priority'), line),
+        'completed': parse_bool(row.get('completed'), line),
+        'duration_days': parse_duration(text_value(row, 'duration_days'), line),
+        'created_at': parse_timestamp(text_value(row, 'created_at'), line) or datetime.now(),
+        'completed_at': parse_timestamp(text_value(row, 'completed_at'), line),
+    }
+    # A completion time implies completion; a completed task without one is
+    # taken to have been completed when it was created
+    if task['completed_at'] is not None:
+        task['completed'] = True
+    elif task['completed']:
+        task['completed_at'] = task['created_at']
+    employee_ids = [refs.resolve(Employee, ref, line) for ref in split_refs(row.get('employees'))]
+    return task, employee_ids
+
+
+ROW_BUILDERS = {
+    'projects': (Project, project_row),
+    'employees': (Employee, employee_row),
+    'tasks': (Task, task_row),
+}
+
+
+class BulkImporter:
+    """Validates rows and inserts them in executemany batches.
+
+    Everything runs inside the session's single transaction; the caller
+    commits once at the end or rolls back on error.
+    """
+
+    def __init__(self, session, kind, batch_size=DEFAULT_BATCH_SIZE, skip_invalid=False, on_batch=None, on_skip=None):
+        self.session = session
+        self.model, self.build = ROW_BUILDERS[kind]
+        self.batch_size = batch_size
+        self.skip_invalid = skip_invalid
+        self.on_batch = on_batch
+        self.on_skip = on_skip
+        self.refs = References(session)
+        self.imported = 0
+        self.assigned = 0
+        self.skipped = 0
+
+    def run(self, rows):
+        batch, assignments = [], []
+        for line, row in rows:
+            try:
+                values = self.build(row, line, self.refs)
+            except RowError as e:
+                if not self.skip_invalid:
+                    raise
+                self.skipped += 1
+                if self.on_skip:
+                    self.on_skip(e)
+                continue
+            if self.model is Task:
+                values, employee_ids = values
+                assignments.append(employee_ids)
+            batch.append(values)
+            if len(batch) >= self.batch_size:
+                self._flush(batch, assignments)
+                batch, assignments = [], []
+        if batch:
+            self._flush(batch, assignments)
+        return self.imported
+
+    def _flush(self, batch, assignments):
+        table = self.model.__table__
+        self.session.execute(insert(table), batch)
+        if any(assignments):
+            # The insert above holds SQLite's write lock and rows without an
+            # explicit id get max(rowid) + 1, so the batch occupies the last
+            # len(batch) ids. This avoids a RETURNING round trip per row.
+            last_id = self.session.execute(select(func.max(table.c.id))).scalar()
+            first_id = last_id - len(batch) + 1
+            links = [
+                {'employee_id': employee_id, 'task_id': first_id + offset}
+                for offset, employee_ids in enumerate(assignments)
+                for employee_id in dict.fromkeys(employee_ids)
+            ]
+            self.session.execute(insert(employee_task), links)
+            self.assigned += len(links)
+        self.imported += len(batch)
+        if self.on_batch:
+            self.on_batch(self)
+
+
+def run_import(kind, source, fmt, batch_size, skip_invalid):
+    """Body of import: everything in one transaction, progress on stderr"""
+    import time
+    import click
+    from database import sessionLocal
+    fmt = fmt or detect_format(source)
+    started = time.perf_counter()
+
+    def progress(importer):
+        rate = importer.imported / max(time.perf_counter() - started, 1e-9)
+        click.echo(f"{importer.imported} {kind} imported ({rate:,.0f} rows/s)", err=True)
+
+    session = sessionLocal()
+    try:
+        importer = BulkImporter(
+            session, kind, batch_size=batch_size, skip_invalid=skip_invalid,
+            on_batch=progress, on_skip=lambda e: click.echo(f"Skipped {e}", err=True),
+        )
+        with open_source(source) as stream:
+            importer.run(read_rows(stream, fmt))
+        session.commit()
+        elapsed = time.perf_counter() - started
+        click.echo(f"Imported {importer.imported} {kind} in {elapsed:.2f}s"
+                   + (f", {importer.assigned} assignments" if importer.assigned else "")
+                   + (f", skipped {importer.skipped} invalid rows" if importer.skipped else "") + ".")
+    except Exception as e:
+        session.rollback()
+        click.echo(f"Error importing {kind}, nothing was imported: {e}")
+    finally:
+        session.close()
@@ -0,0 +1,452 @@
+"""Opt-in write journal: queue write commands, apply them in bulk later.
+
+With PM_WRITE_JOURNAL=on, create-project, add-task, add-employee,
+assign-employee, complete-task and reopen-task append one JSON line to a
+file next to the database (project_management.db.writes.jsonl) and return
+without opening the database. `flush`, or the background flusher of the
+shell and the server, applies the queued lines in transactions of many
+records each, so a script of thousands of add-task calls pays for a few
+commits instead of one fsync per row.
+
+Records carry the time they were queued. It becomes the task's
+created_at or completed_at, and the task_events the history triggers
+write while a record is applied are re-dated to it, so --as-of reports
+and burndown place a journaled write at the same moment. Event ids then
+no longer follow time, so --as-of picks each task's latest event by
+occurred_at (see queries.no_later_event): a write queued before a direct
+write to the same task counts as the earlier one even though flush
+applied it last.
+
+The first line of a journal file holds a random generation id. The
+journal_state row stores the generation and byte position up to which
+records are applied, and is advanced in the same transaction that applies
+them; a crash at any point leaves either the whole batch or none of it
+applied, and the next flush carries on from the stored position. Once
+everything is applied the file is removed and the next append starts a
+new generation.
+
+Appends take an exclusive flock on the file, so concurrent writers never
+interleave; where fcntl is missing (Windows) only one process may append
+at a time. Appending only imports the standard library.
+"""
+import json
+import os
+import threading
+import uuid
+import click
+from choices import DEFAULT_BATCH_SIZE, DEFAULT_DATABASE_URL
+from report_cache import sqlite_path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Seconds between background flushes in the shell and the server
+FLUSH_INTERVAL = 1.0
+
+OPERATIONS = ['create-project', 'add-task', 'add-employee', 'assign-employee', 'complete-task', 'reopen-task']
+
+
+class Journal:
+    """The append-only journal file of one database"""
+
+    def __init__(self, path):
+        self.path = path
+
+    @classmethod
+    def for_database(cls, url=None):
+        """The journal of $PM_DATABASE_URL, or None if it is not a SQLite file"""
+        database = sqlite_path(url or os.environ.get("PM_DATABASE_URL", DEFAULT_DATABASE_URL))
+        return None if database is None else cls(database + ".writes.jsonl")
+
+    @classmethod
+    def open(cls):
+        """The journal to queue writes in, or None unless PM_WRITE_JOURNAL is on"""
+        if os.environ.get("PM_WRITE_JOURNAL", "").lower() not in ("on", "1", "yes", "true"):
+            return None
+        return cls.for_database()
+
+    def _lock(self):
+        """Descriptor of the current file, created if missing, locked
+        exclusively; the lock goes with os.close()"""
+        while True:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+            if fcntl is None:
+                return fd
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                # A flush may have removed the file while we waited
+                if os.stat(self.path).st_ino == os.fstat(fd).st_ino:
+                    return fd
+            except FileNotFoundError:
+                pass
+            os.close(fd)
+
+    def append(self, op, record):
+        line = json.dumps({"op": op, **record}, separators=(",", ":")) + "\n"
+        fd = self._lock()
+        try:
+            size = os.fstat(fd).st_size
+            if size == 0:
+                os.write(fd, (json.dumps({"generation": uuid.uuid4().hex}) + "\n").encode())
+            elif os.pread(fd, 1, size - 1) != b"\n":
+                # A writer died mid-line; keep its fragment off this record
+                os.write(fd, b"\n")
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+
+    def snapshot(self):
+        """(generation, header length, size) of the file, None if there is
+        none. Every line before size is complete except a fragment left by
+        a writer that died mid-line."""
+        if not os.path.exists(self.path):
+            return None
+        fd = self._lock()
+        try:
+            size = os.fstat(fd).st_size
+            if size == 0:
+                return None
+            with os.fdopen(os.dup(fd), "rb") as f:
+                header = f.readline()
+        finally:
+            os.close(fd)
+        try:
+            generation = json.loads(header)["generation"]
+        except (ValueError, KeyError, TypeError):
+            raise click.ClickException(f"{self.path} does not start with a journal header")
+        return generation, len(header), size
+
+    def remove(self, generation, size):
+        """Delete the file if it is still this generation at this size,
+        i.e. nothing was appended since it was applied"""
+        fd = self._lock()
+        try:
+            if os.fstat(fd).st_size == size and self.snapshot_generation(fd) == generation:
+                os.remove(self.path)
+                return True
+            return False
+        finally:
+            os.close(fd)
+
+    def snapshot_generation(self, fd):
+        with os.fdopen(os.dup(fd), "rb") as f:
+            f.seek(0)
+            try:
+                return json.loads(f.readline())["generation"]
+            except (ValueError, KeyError, TypeError):
+                return None
+
+    def batches(self, start, end, batch_size):
+        """Yield ([(position, record or None)], end position) for the lines
+        between start and end; None marks a line that is not a record"""
+        batch = []
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            position = start
+            while position < end:
+                line = f.readline(end - position)
+                if not line:
+                    break
+                record = None
+                if line.endswith(b"\n"):
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        pass
+                if line.strip():
+                    batch.append((position, record if isinstance(record, dict) else None))
+                position += len(line)
+                if len(batch) >= batch_size:
+                    yield batch, position
+                    batch = []
+        if batch:
+            yield batch, end
+
+
+def queue_write(op, error, message, **record):
+    """Append a write to the journal if PM_WRITE_JOURNAL is on.
+
+    Returns False when the journal is off and the command should write to
+    the database itself. Appending never touches the database, so ids are
+    only checked when flush applies the write; a record naming missing ids
+    is then reported and skipped. Records carry the time they were queued,
+    which becomes the task's created_at or completed_at.
+    """
+    from datetime import datetime
+    journal = Journal.open()
+    if journal is None:
+        return False
+    try:
+        if record.get('deadline'):
+            datetime.strptime(record['deadline'], "%Y-%m-%d")
+        journal.append(op, {**record, 'at': datetime.now().isoformat(sep=' ')})
+        click.echo(message)
+    except (ValueError, OSError) as e:
+        click.echo(f"{error}: {e}")
+    return True
+
+
+def parse_day(value):
+    from datetime import datetime
+    return None if value is None else datetime.strptime(value, "%Y-%m-%d")
+
+
+def parse_time(value):
+    """The queued time of a record; now for records from before it was kept"""
+    from datetime import datetime
+    return datetime.now() if value is None else datetime.fromisoformat(value)
+
+
+def record_statement(record):
+    """(statement, parameters) applying one record; parameters is None
+    for statements that cannot be batched"""
+    from sqlalchemy import insert
+    from models import Project, Task, Employee
+    from queries import id_spec_clause, task_selection, bulk_assign_statement, set_completion_statement
+    from idspec import parse_id_spec
+    op = record.get("op")
+    if op == "create-project":
+        return insert(Project.__table__), {
+            "name": record["name"], "description": record.get("description", ""),
+            "deadline": parse_day(record.get("deadline")),
+        }
+    if op == "add-task":
+        return insert(Task.__table__), {
+            "project_id": record["project_id"], "title": record["title"],
+            "description": record.get("description", ""), "deadline": parse_day(record.get("deadline")),
+            "priority": record.get("priority", "Medium"), "completed": False,
+            "duration_days": record.get("duration_days", 1), "created_at": parse_time(record.get("at")),
+        }
+    if op == "add-employee":
+        return insert(Employee.__table__), {"name": record["name"], "role": record["role"]}
+    if op == "assign-employee":
+        task_clauses = task_selection(parse_id_spec(record["task_ids"]), record.get("project_id"))
+        employee_clause = id_spec_clause(Employee.id, parse_id_spec(record["employee_ids"]))
+        return bulk_assign_statement(task_clauses, employee_clause), None
+    if op in ("complete-task", "reopen-task"):
+        task_ids = record.get("task_ids")
+        clauses = task_selection(
+            parse_id_spec(task_ids) if task_ids is not None else None, record.get("project_id"),
+            record.get("assignee_id"), parse_day(record.get("deadline_before")),
+        )
+        return set_completion_statement(clauses, op == "complete-task", parse_time(record.get("at"))), None
+    raise ValueError(f"unknown operation {op!r}")
+
+
+def check_ids(session, record):
+    """Raise LookupError if an assign-employee, complete-task or
+    reopen-task record names ids that do not exist, which the direct
+    commands refuse; see assignments.find_existing"""
+    from models import Task, Employee
+    from queries import id_spec_clause, task_selection
+    from idspec import parse_id_spec, describe_missing
+    from assignments import find_existing
+    op = record.get("op")
+    if op == "assign-employee":
+        task_ids, employee_ids = parse_id_spec(record["task_ids"]), parse_id_spec(record["employee_ids"])
+        project_id = record.get("project_id")
+        checks = [
+            ("Tasks", Task.id, Task.title, task_selection(task_ids, project_id), task_ids,
+             f" in project {project_id}" if project_id is not None else ""),
+            ("Employees", Employee.id, Employee.name, [id_spec_clause(Employee.id, employee_ids)], employee_ids, ""),
+        ]
+    elif op in ("complete-task", "reopen-task") and record.get("task_ids") is not None:
+        task_ids = parse_id_spec(record["task_ids"])
+        checks = [("Tasks", Task.id, Task.title, [id_spec_clause(Task.id, task_ids)], task_ids, "")]
+    else:
+        return
+    for label, id_column, label_column, clauses, spec, scope in checks:
+        _, _, missing, missing_count = find_existing(session, id_column, label_column, clauses, spec)
+        if missing:
+            raise LookupError(f"{label} not found{scope}: {describe_missing(missing, missing_count)}")
+
+
+def last_event_id(session):
+    from sqlalchemy import select, func
+    from models import task_events
+    return session.execute(select(func.max(task_events.c.id))).scalar() or 0
+
+
+def stamp_events(session, after_id, at=None):
+    """Date the task_events written since after_id at the time their record
+    was queued rather than the flush time the triggers used, so --as-of
+    agrees with created_at/completed_at. Without at, each event takes its
+    task's created_at, which a queued add-task sets to its time."""
+    from sqlalchemy import select, update, func
+    from models import task_events, Task
+    if at is None:
+        at = func.coalesce(
+            select(Task.created_at).where(Task.id == task_events.c.task_id).scalar_subquery(),
+            task_events.c.occurred_at,
+        )
+    session.execute(update(task_events).where(task_events.c.id > after_id).values(occurred_at=at))
+
+
+def apply_batch(session, batch, on_error):
+    """Execute a batch's records; consecutive inserts into one table go out
+    as a single executemany. Returns the number applied; records naming
+    missing ids go to on_error (see check_ids).
+
+    A failed executemany is rolled back to a savepoint and its records
+    retried one by one, so only the bad ones are skipped. Every record is
+    a single statement, and SQLite undoes a failed statement without
+    ending the transaction.
+    """
+    from models import Task
+
+    def insert_rows(statement, rows):
+        mark = last_event_id(session) if statement.table is Task.__table__ else None
+        try:
+            with session.begin_nested():
+                session.execute(statement, [params for _, params in rows])
+            done = len(rows)
+        except Exception:
+            done = 0
+            for position, params in rows:
+                try:
+                    session.execute(statement, params)
+                    done += 1
+                except Exception as e:
+                    on_error(position, e)
+        if mark is not None and done:
+            stamp_events(session, mark)
+        return done
+
+    applied = 0
+    pending = None  # (insert statement, [(position, parameters)])
+    for position, record in batch:
+        try:
+            if record is None:
+                raise ValueError("not a journal record")
+            statement, params = record_statement(record)
+        except (ValueError, KeyError, TypeError) as e:
+            on_error(position, e)
+            continue
+        if pending and params is not None and pending[0].table is statement.table:
+            pending[1].append((position, params))
+            continue
+        if pending:
+            applied += insert_rows(*pending)
+            pending = None
+        if params is not None:
+            pending = (statement, [(position, params)])
+            continue
+        try:
+            check_ids(session, record)
+            mark = last_event_id(session)
+            if session.execute(statement).rowcount and "at" in record:
+                stamp_events(session, mark, parse_time(record["at"]))
+            applied += 1
+        except Exception as e:
+            on_error(position, e)
+    if pending:
+        applied += insert_rows(*pending)
+    return applied
+
+
+def flush_journal(session, journal, batch_size=DEFAULT_BATCH_SIZE, on_error=None):
+    """Apply every record not applied yet; returns (applied, failed).
+
+    Each batch commits together with the new journal_state position. The
+    update of that row comes first and checks the old position, so it
+    takes SQLite's write lock before anything else and a concurrent flush
+    that already applied the batch makes it a no-op.
+    """
+    from sqlalchemy import select, update
+    from models import journal_state
+    applied = failed = 0
+
+    def error(position, e):
+        nonlocal failed
+        failed += 1
+        if on_error:
+            on_error(position, e)
+
+    while True:
+        snapshot = journal.snapshot()
+        if snapshot is None:
+            return applied, failed
+        generation, header, size = snapshot
+        stored_generation, stored_position = session.execute(
+            select(journal_state.c.generation, journal_state.c.position).where(journal_state.c.id == 1)
+        ).one()
+        session.rollback()
+        # A state left by an earlier generation means none of this file is applied
+        position = stored_position if stored_generation == generation else header
+        if position >= size:
+            if journal.remove(generation, size):
+                return applied, failed
+            continue
+        for batch, end in journal.batches(position, size, batch_size):
+            claimed = session.execute(
+                update(journal_state)
+                .where(journal_state.c.id == 1, journal_state.c.generation == stored_generation,
+                       journal_state.c.position == stored_position)
+                .values(generation=generation, position=end)
+            ).rowcount
+            if not claimed:
+                # Another flush got here first; start over from its position
+                session.rollback()
+                break
+            count = apply_batch(session, batch, error)
+            session.commit()
+            applied += count
+            stored_generation, stored_position = generation, end
+
+
+def run_flush():
+    """Body of flush: apply the journal of $PM_DATABASE_URL and report"""
+    import time
+    from database import sessionLocal
+    journal = Journal.for_database()
+    if journal is None:
+        click.echo("The write journal needs a SQLite database file.")
+        return
+    session = sessionLocal()
+    try:
+        started = time.perf_counter()
+        applied, failed = flush_journal(session, journal, on_error=lambda position, e: click.echo(
+            f"Skipped the record at byte {position}: {e}"))
+        click.echo(f"Applied {applied} queued writes in {time.perf_counter() - started:.2f}s"
+                   f"{f', skipped {failed}' if failed else ''}.")
+    except Exception as e:
+        session.rollback()
+        click.echo(f"Error flushing the write journal: {e}")
+    finally:
+        session.close()
+
+
+class Flusher(threading.Thread):
+    """Daemon thread flushing a journal when started, which replays what an
+    earlier process left unapplied, every FLUSH_INTERVAL seconds after
+    that and once more when stopped"""
+
+    def __init__(self, journal, make_session, interval=FLUSH_INTERVAL):
+        super().__init__(name="journal-flusher", daemon=True)
+        self.journal = journal
+        self.make_session = make_session
+        self.interval = interval
+        self.stopping = threading.Event()
+
+    def flush(self):
+        session = self.make_session()
+        try:
+            flush_journal(session, self.journal, on_error=lambda position, e: click.echo(
+                f"Journal record at byte {position} skipped: {e}", err=True))
+        except Exception as e:
+            session.rollback()
+            click.echo(f"Error flushing the write journal: {e}", err=True)
+        finally:
+            session.close()
+
+    def run(self):
+        self.flush()
+        while not self.stopping.wait(self.interval):
+            self.flush()
+
+    def stop(self):
+        self.stopping.set()
+        self.join()
+        self.flush()
@@ -0,0 +1,78 @@
+"""Add task timestamps
+
+Revision ID: 06fd808234ac
+Revises: 2d11685ecf2f
+Create Date: 2026-10-18 19:05:33.538300
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '06fd808234ac'
+down_revision: Union[str, None] = '2d11685ecf2f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Copy of triggers.TIMESTAMP_TRIGGERS as of this revision
+EVENT_TIME = "strftime('%Y-%m-%d %H:%M:%f000', 'now', 'localtime')"
+
+TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_insert_timestamps AFTER INSERT ON tasks
+    WHEN NEW.created_at IS NULL OR (NEW.completed AND NEW.completed_at IS NULL)
+    BEGIN
+        UPDATE tasks SET created_at = COALESCE(created_at, {EVENT_TIME}),
+            completed_at = CASE WHEN completed THEN COALESCE(completed_at, {EVENT_TIME}) END
+        WHERE id = NEW.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_update_timestamps AFTER UPDATE OF completed ON tasks
+    WHEN COALESCE(OLD.completed, 0) != COALESCE(NEW.completed, 0) AND OLD.completed_at IS NEW.completed_at
+    BEGIN
+        UPDATE tasks SET completed_at = CASE WHEN NEW.completed THEN {EVENT_TIME} END WHERE id = NEW.id;
+    END
+    """,
+]
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('created_at', sa.DateTime(), nullable=True))
+    op.add_column('tasks', sa.Column('completed_at', sa.DateTime(), nullable=True))
+    # Backfill from the task history: creation is a task's first event and
+    # completion the first event of its current run of completed states
+    op.execute(f"""
+        UPDATE tasks SET
+            created_at = COALESCE((
+                SELECT min(e.occurred_at) FROM task_events e
+                WHERE e.task_id = tasks.id AND e.employee_id IS NULL
+            ), {EVENT_TIME}),
+            completed_at = CASE WHEN completed THEN COALESCE((
+                SELECT min(e.occurred_at) FROM task_events e
+                WHERE e.task_id = tasks.id AND e.employee_id IS NULL AND e.completed
+                  AND e.id > COALESCE((
+                      SELECT max(o.id) FROM task_events o
+                      WHERE o.task_id = tasks.id AND o.employee_id IS NULL AND NOT o.completed
+                  ), 0)
+            ), {EVENT_TIME}) END
+    """)
+    op.create_index('ix_tasks_project_created_day', 'tasks', ['project_id', sa.text('date(created_at)')], unique=False,
+                    sqlite_where=sa.text('created_at IS NOT NULL'))
+    op.create_index('ix_tasks_project_completed_day', 'tasks', ['project_id', sa.text('date(completed_at)')], unique=False,
+                    sqlite_where=sa.text('completed_at IS NOT NULL'))
+    for statement in TRIGGERS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in TRIGGERS:
+        name = statement.split("EXISTS", 1)[1].split()[0]
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_index('ix_tasks_project_completed_day', table_name='tasks')
+    op.drop_index('ix_tasks_project_created_day', table_name='tasks')
+    op.drop_column('tasks', 'completed_at')
+    op.drop_column('tasks', 'created_at')
@@ -0,0 +1,43 @@
+"""Store task priority as an integer
+
+Revision ID: 1f53577d0638
+Revises: c1cc94ec5115
+Create Date: 2026-10-18 18:34:59.476359
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f53577d0638'
+down_revision: Union[str, None] = 'c1cc94ec5115'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Low/Medium/High text becomes 1/2/3; anything unrecognised was only
+    # possible through raw SQL and is read as Medium. SQLite cannot change
+    # a column's type, so the values go through a new column.
+    op.add_column('tasks', sa.Column('priority_value', sa.SmallInteger(), server_default=sa.text('2'), nullable=False))
+    op.execute(
+        "UPDATE tasks SET priority_value = CASE lower(priority) "
+        "WHEN 'low' THEN 1 WHEN 'high' THEN 3 ELSE 2 END"
+    )
+    op.drop_column('tasks', 'priority')
+    op.alter_column('tasks', 'priority_value', new_column_name='priority')
+    op.create_index('ix_tasks_priority_deadline', 'tasks', [sa.text('priority DESC'), 'deadline'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_priority_deadline', table_name='tasks')
+    op.add_column('tasks', sa.Column('priority_label', sa.VARCHAR(), server_default=sa.text("'Medium'"), nullable=False))
+    op.execute(
+        "UPDATE tasks SET priority_label = CASE priority "
+        "WHEN 1 THEN 'Low' WHEN 3 THEN 'High' ELSE 'Medium' END"
+    )
+    op.drop_column('tasks', 'priority')
+    op.alter_column('tasks', 'priority_label', new_column_name='priority')
@@ -0,0 +1,106 @@
+"""Add task event history
+
+Revision ID: 2d11685ecf2f
+Revises: 6d11e9e2c396
+Create Date: 2026-10-18 18:57:37.666369
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d11685ecf2f'
+down_revision: Union[str, None] = '6d11e9e2c396'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Copy of triggers.HISTORY_TRIGGERS as of this revision
+EVENT_TIME = "strftime('%Y-%m-%d %H:%M:%f000', 'now', 'localtime')"
+
+TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_insert_history AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO task_events (task_id, occurred_at, event, project_id, priority, deadline, completed)
+        VALUES (NEW.id, {EVENT_TIME}, 'created', NEW.project_id, NEW.priority, NEW.deadline, NEW.completed);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_update_history AFTER UPDATE OF project_id, priority, deadline, completed ON tasks
+    WHEN OLD.project_id IS NOT NEW.project_id OR OLD.priority IS NOT NEW.priority
+        OR OLD.deadline IS NOT NEW.deadline OR OLD.completed IS NOT NEW.completed
+    BEGIN
+        INSERT INTO task_events (task_id, occurred_at, event, project_id, priority, deadline, completed)
+        VALUES (NEW.id, {EVENT_TIME}, 'updated', NEW.project_id, NEW.priority, NEW.deadline, NEW.completed);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_delete_history AFTER DELETE ON tasks
+    BEGIN
+        INSERT INTO task_events (task_id, occurred_at, event, project_id, priority, deadline, completed)
+        VALUES (OLD.id, {EVENT_TIME}, 'deleted', OLD.project_id, OLD.priority, OLD.deadline, OLD.completed);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_employee_task_insert_history AFTER INSERT ON employee_task
+    BEGIN
+        INSERT INTO task_events (task_id, occurred_at, event, employee_id)
+        VALUES (NEW.task_id, {EVENT_TIME}, 'assigned', NEW.employee_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_employee_task_update_history AFTER UPDATE ON employee_task
+    WHEN OLD.task_id IS NOT NEW.task_id OR OLD.employee_id IS NOT NEW.employee_id
+    BEGIN
+        INSERT INTO task_events (task_id, occurred_at, event, employee_id)
+        VALUES (OLD.task_id, {EVENT_TIME}, 'unassigned', OLD.employee_id);
+        INSERT INTO task_events (task_id, occurred_at, event, employee_id)
+        VALUES (NEW.task_id, {EVENT_TIME}, 'assigned', NEW.employee_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_employee_task_delete_history AFTER DELETE ON employee_task
+    BEGIN
+        INSERT INTO task_events (task_id, occurred_at, event, employee_id)
+        VALUES (OLD.task_id, {EVENT_TIME}, 'unassigned', OLD.employee_id);
+    END
+    """,
+]
+
+
+def upgrade() -> None:
+    op.create_table('task_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('occurred_at', sa.DateTime(), nullable=False),
+    sa.Column('event', sa.String(), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=True),
+    sa.Column('project_id', sa.Integer(), nullable=True),
+    sa.Column('priority', sa.SmallInteger(), nullable=True),
+    sa.Column('deadline', sa.DateTime(), nullable=True),
+    sa.Column('completed', sa.Boolean(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_task_events_task_occurred', 'task_events', ['task_id', 'occurred_at'], unique=False)
+    # History starts now: every existing task and assignment as of the upgrade
+    op.execute(f"""
+        INSERT INTO task_events (task_id, occurred_at, event, project_id, priority, deadline, completed)
+        SELECT id, {EVENT_TIME}, 'created', project_id, priority, deadline, completed FROM tasks ORDER BY id
+    """)
+    op.execute(f"""
+        INSERT INTO task_events (task_id, occurred_at, event, employee_id)
+        SELECT task_id, {EVENT_TIME}, 'assigned', employee_id FROM employee_task ORDER BY task_id, employee_id
+    """)
+    for statement in TRIGGERS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in TRIGGERS:
+        name = statement.split("EXISTS", 1)[1].split()[0]
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_index('ix_task_events_task_occurred', table_name='task_events')
+    op.drop_table('task_events')
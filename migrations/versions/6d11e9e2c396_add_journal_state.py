@@ -0,0 +1,33 @@
+"""Add journal state
+
+Revision ID: 6d11e9e2c396
+Revises: 9a6eb6a76afb
+Create Date: 2026-10-18 18:50:15.081388
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d11e9e2c396'
+down_revision: Union[str, None] = '9a6eb6a76afb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('journal_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('generation', sa.String(), server_default=sa.text("''"), nullable=False),
+    sa.Column('position', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Nothing journaled has been applied yet
+    op.execute("INSERT INTO journal_state (id, generation, position) VALUES (1, '', 0)")
+
+
+def downgrade() -> None:
+    op.drop_table('journal_state')
@@ -0,0 +1,34 @@
+"""Add task dependencies and durations
+
+Revision ID: 9a6eb6a76afb
+Revises: 1f53577d0638
+Create Date: 2026-10-18 18:37:23.183795
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a6eb6a76afb'
+down_revision: Union[str, None] = '1f53577d0638'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('task_dependencies',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('depends_on_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['depends_on_id'], ['tasks.id'], ),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+    sa.PrimaryKeyConstraint('task_id', 'depends_on_id')
+    )
+    op.add_column('tasks', sa.Column('duration_days', sa.Integer(), server_default=sa.text('1'), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('tasks', 'duration_days')
+    op.drop_table('task_dependencies')
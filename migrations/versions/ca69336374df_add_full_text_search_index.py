@@ -0,0 +1,85 @@
+"""Add full-text search index
+
+Revision ID: ca69336374df
+Revises: 3b98808b2728
+Create Date: 2026-10-18 18:24:16.222378
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ca69336374df'
+down_revision: Union[str, None] = '3b98808b2728'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Copy of the search DDL in triggers.py as of this revision
+SEARCH_TABLES = {
+    "tasks_fts": ("tasks", ["title", "description"]),
+    "projects_fts": ("projects", ["name", "description"]),
+}
+
+
+def search_table_ddl(name, table, columns):
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5(
+            {', '.join(columns)}, content='{table}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        """,
+        f"INSERT INTO {name} ({name}, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+    ]
+
+
+def search_trigger_ddl(name, table, columns):
+    cols = ", ".join(columns)
+    new = ", ".join(f"NEW.{column}" for column in columns)
+    old = ", ".join(f"OLD.{column}" for column in columns)
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_insert_search AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO {name} (rowid, {cols}) VALUES (NEW.id, {new});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_delete_search AFTER DELETE ON {table}
+        BEGIN
+            INSERT INTO {name} ({name}, rowid, {cols}) VALUES ('delete', OLD.id, {old});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_update_search AFTER UPDATE OF {cols} ON {table}
+        BEGIN
+            INSERT INTO {name} ({name}, rowid, {cols}) VALUES ('delete', OLD.id, {old});
+            INSERT INTO {name} (rowid, {cols}) VALUES (NEW.id, {new});
+        END
+        """,
+    ]
+
+
+SEARCH_DDL = [
+    statement
+    for name, (table, columns) in SEARCH_TABLES.items()
+    for statement in search_table_ddl(name, table, columns) + search_trigger_ddl(name, table, columns)
+]
+
+
+def upgrade() -> None:
+    for statement in SEARCH_DDL:
+        op.execute(statement)
+    # Index the rows that already exist
+    for name in SEARCH_TABLES:
+        op.execute(f"INSERT INTO {name} ({name}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    for name, (table, columns) in SEARCH_TABLES.items():
+        for action in ("insert", "delete", "update"):
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_{action}_search")
+        op.execute(f"DROP TABLE IF EXISTS {name}")
@@ -0,0 +1,56 @@
+"""Count reassigned employee tasks
+
+Revision ID: ef3c166ef940
+Revises: 06fd808234ac
+Create Date: 2026-10-18 19:25:16.228520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ef3c166ef940'
+down_revision: Union[str, None] = '06fd808234ac'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Copy of the employee_task update trigger in triggers.COUNTER_TRIGGERS as of this revision
+TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_employee_task_update_counters AFTER UPDATE OF task_id, employee_id ON employee_task
+    WHEN OLD.task_id IS NOT NEW.task_id OR OLD.employee_id IS NOT NEW.employee_id
+    BEGIN
+        UPDATE employees SET task_count = task_count - 1,
+            completed_count = completed_count
+                - COALESCE((SELECT completed FROM tasks WHERE id = OLD.task_id), 0)
+        WHERE id = OLD.employee_id;
+        UPDATE employees SET task_count = task_count + 1,
+            completed_count = completed_count
+                + COALESCE((SELECT completed FROM tasks WHERE id = NEW.task_id), 0)
+        WHERE id = NEW.employee_id;
+    END
+    """,
+]
+
+
+def upgrade() -> None:
+    # Earlier reassignments left the employee counters behind; recount them
+    op.execute("""
+        UPDATE employees SET
+            task_count = (SELECT count(*) FROM employee_task WHERE employee_id = employees.id),
+            completed_count = (
+                SELECT COALESCE(sum(COALESCE(t.completed, 0)), 0) FROM employee_task et
+                JOIN tasks t ON t.id = et.task_id WHERE et.employee_id = employees.id
+            )
+    """)
+    op.execute("UPDATE data_version SET version = version + 1 WHERE id = 1")
+    for statement in TRIGGERS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for statement in TRIGGERS:
+        name = statement.split("EXISTS", 1)[1].split()[0]
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
@@ -0,0 +1,144 @@
+"""Add materialized task counters
+
+Revision ID: f4bd95859d74
+Revises: 7fb402787731
+Create Date: 2026-10-18 18:18:21.491148
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4bd95859d74'
+down_revision: Union[str, None] = '7fb402787731'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Copy of triggers.COUNTER_TRIGGERS as of this revision
+TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_insert_counters AFTER INSERT ON tasks
+    BEGIN
+        UPDATE projects SET task_count = task_count + 1,
+            completed_count = completed_count + COALESCE(NEW.completed, 0)
+        WHERE id = NEW.project_id;
+        UPDATE task_totals SET task_count = task_count + 1,
+            completed_count = completed_count + COALESCE(NEW.completed, 0)
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_delete_counters AFTER DELETE ON tasks
+    BEGIN
+        UPDATE projects SET task_count = task_count - 1,
+            completed_count = completed_count - COALESCE(OLD.completed, 0)
+        WHERE id = OLD.project_id;
+        UPDATE task_totals SET task_count = task_count - 1,
+            completed_count = completed_count - COALESCE(OLD.completed, 0)
+        WHERE id = 1;
+        -- Assignments still pointing at the task lose its completion now;
+        -- deleting them later only takes away the assignment itself.
+        UPDATE employees SET completed_count = completed_count - COALESCE(OLD.completed, 0)
+        WHERE id IN (SELECT employee_id FROM employee_task WHERE task_id = OLD.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_update_counters AFTER UPDATE OF completed, project_id ON tasks
+    WHEN COALESCE(OLD.completed, 0) != COALESCE(NEW.completed, 0) OR OLD.project_id IS NOT NEW.project_id
+    BEGIN
+        UPDATE projects SET task_count = task_count - 1,
+            completed_count = completed_count - COALESCE(OLD.completed, 0)
+        WHERE id = OLD.project_id;
+        UPDATE projects SET task_count = task_count + 1,
+            completed_count = completed_count + COALESCE(NEW.completed, 0)
+        WHERE id = NEW.project_id;
+        UPDATE task_totals SET
+            completed_count = completed_count + COALESCE(NEW.completed, 0) - COALESCE(OLD.completed, 0)
+        WHERE id = 1;
+        UPDATE employees SET
+            completed_count = completed_count + COALESCE(NEW.completed, 0) - COALESCE(OLD.completed, 0)
+        WHERE id IN (SELECT employee_id FROM employee_task WHERE task_id = NEW.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_employee_task_insert_counters AFTER INSERT ON employee_task
+    BEGIN
+        UPDATE employees SET task_count = task_count + 1,
+            completed_count = completed_count
+                + COALESCE((SELECT completed FROM tasks WHERE id = NEW.task_id), 0)
+        WHERE id = NEW.employee_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_employee_task_delete_counters AFTER DELETE ON employee_task
+    BEGIN
+        UPDATE employees SET task_count = task_count - 1,
+            completed_count = completed_count
+                - COALESCE((SELECT completed FROM tasks WHERE id = OLD.task_id), 0)
+        WHERE id = OLD.employee_id;
+    END
+    """,
+]
+
+BACKFILL = [
+    """
+    UPDATE projects SET
+        task_count = (SELECT COUNT(*) FROM tasks WHERE tasks.project_id = projects.id),
+        completed_count = (SELECT COALESCE(SUM(tasks.completed), 0) FROM tasks WHERE tasks.project_id = projects.id)
+    """,
+    """
+    UPDATE employees SET
+        task_count = (SELECT COUNT(*) FROM employee_task WHERE employee_task.employee_id = employees.id),
+        completed_count = (
+            SELECT COALESCE(SUM(tasks.completed), 0) FROM employee_task
+            JOIN tasks ON tasks.id = employee_task.task_id
+            WHERE employee_task.employee_id = employees.id
+        )
+    """,
+    """
+    INSERT INTO task_totals (id, task_count, completed_count)
+    SELECT 1, COUNT(*), COALESCE(SUM(completed), 0) FROM tasks
+    """,
+]
+
+TRIGGER_NAMES = [
+    'trg_tasks_insert_counters',
+    'trg_tasks_delete_counters',
+    'trg_tasks_update_counters',
+    'trg_employee_task_insert_counters',
+    'trg_employee_task_delete_counters',
+]
+
+
+def upgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('task_totals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('completed_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.add_column('employees', sa.Column('task_count', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.add_column('employees', sa.Column('completed_count', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.create_index(op.f('ix_employees_task_count'), 'employees', ['task_count'], unique=False)
+    op.add_column('projects', sa.Column('task_count', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.add_column('projects', sa.Column('completed_count', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    # ### end Alembic commands ###
+    for statement in BACKFILL + TRIGGERS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for name in TRIGGER_NAMES:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_column('projects', 'completed_count')
+    op.drop_column('projects', 'task_count')
+    op.drop_index(op.f('ix_employees_task_count'), table_name='employees')
+    op.drop_column('employees', 'completed_count')
+    op.drop_column('employees', 'task_count')
+    op.drop_table('task_totals')
+    # ### end Alembic commands ###
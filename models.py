@@ -1,23 +1,94 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Table
+from sqlalchemy import Column, Integer, SmallInteger, String, ForeignKey, DateTime, Boolean, Table, Index, DDL, TypeDecorator, event, func, text
 from sqlalchemy.orm import relationship
 from database import Base
+from triggers import COUNTER_TRIGGERS, DATA_VERSION_TRIGGERS, HISTORY_TRIGGERS, TIMESTAMP_TRIGGERS, SEARCH_DDL
+from choices import Priority
 import datetime
 
+class PriorityType(TypeDecorator):
+    """choices.Priority stored as a SMALLINT; accepts members, values or names"""
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else int(Priority.parse(value))
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else Priority(value)
+
 # Many-to-Many Relationship Table
 employee_task = Table(
     "employee_task",
     Base.metadata,
     Column("employee_id", Integer, ForeignKey("employees.id"), primary_key=True),
-    Column("task_id", Integer, ForeignKey("tasks.id"), primary_key=True)
+    Column("task_id", Integer, ForeignKey("tasks.id"), primary_key=True, index=True)
+)
+
+# Task dependency edges: task_id cannot start before depends_on_id finishes.
+# Both tasks belong to the same project; see add-dependency
+task_dependencies = Table(
+    "task_dependencies",
+    Base.metadata,
+    Column("task_id", Integer, ForeignKey("tasks.id"), primary_key=True),
+    Column("depends_on_id", Integer, ForeignKey("tasks.id"), primary_key=True),
+)
+
+# Single row (id = 1) of whole-database task counts, kept by triggers
+task_totals = Table(
+    "task_totals",
+    Base.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("task_count", Integer, nullable=False, default=0, server_default=text("0")),
+    Column("completed_count", Integer, nullable=False, default=0, server_default=text("0")),
+)
+
+# Single row (id = 1) counting writes, bumped by triggers; keys the report cache
+data_version = Table(
+    "data_version",
+    Base.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("version", Integer, nullable=False, default=0, server_default=text("0")),
+)
+
+# Single row (id = 1): how far the write journal (journal.py) is applied,
+# as the journal file's generation and a byte position within it
+journal_state = Table(
+    "journal_state",
+    Base.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("generation", String, nullable=False, default="", server_default=text("''")),
+    Column("position", Integer, nullable=False, default=0, server_default=text("0")),
+)
+
+# Append-only history of tasks and assignments, written by the triggers in
+# triggers.py. Task events (employee_id NULL) carry the task's state after
+# the change; assignment events name the employee assigned or unassigned.
+# No foreign keys: the history outlives deleted tasks and employees.
+task_events = Table(
+    "task_events",
+    Base.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("task_id", Integer, nullable=False),
+    Column("occurred_at", DateTime, nullable=False),
+    Column("event", String, nullable=False),
+    Column("employee_id", Integer),
+    Column("project_id", Integer),
+    Column("priority", PriorityType),
+    Column("deadline", DateTime),
+    Column("completed", Boolean),
+    Index("ix_task_events_task_occurred", "task_id", "occurred_at"),
 )
 
 class Project(Base):
     __tablename__ = "projects"
 
     id = Column(Integer, primary_key=True)
-    name = Column(String, nullable=False)
+    name = Column(String, nullable=False, index=True)
     description = Column(String)
-    deadline = Column(DateTime)
+    deadline = Column(DateTime, index=True)
+    # Maintained by the triggers in triggers.py; see rebuild-counters
+    task_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    completed_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
 
     tasks = relationship("Task", back_populates="project")    
 
@@ -25,8 +96,11 @@ class Employee(Base):
     __tablename__ = "employees"
 
     id = Column(Integer, primary_key=True)
-    name = Column(String, nullable=False)
+    name = Column(String, nullable=False, index=True)
     role = Column(String)
+    # Maintained by the triggers in triggers.py; see rebuild-counters
+    task_count = Column(Integer, nullable=False, default=0, server_default=text("0"), index=True)
+    completed_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
 
     tasks = relationship("Task", secondary=employee_task, back_populates="employees")     
 
@@ -36,12 +110,48 @@ class Task(Base):
     id = Column(Integer, primary_key=True)
     title = Column(String, nullable=False)
     description = Column(String)
-    deadline = Column(DateTime)
-    priority = Column(String, nullable=False)
+    deadline = Column(DateTime, index=True)
+    priority = Column(PriorityType, nullable=False, default=Priority.MEDIUM, server_default=text(str(int(Priority.MEDIUM))))
     completed = Column(Boolean, default=False)
     project_id = Column(Integer, ForeignKey("projects.id"))
+    # Whole days of work, used by critical-path
+    duration_days = Column(Integer, nullable=False, default=1, server_default=text("1"))
+    # Local time; writes that leave them out get them from the triggers in
+    # triggers.py. completed_at is cleared when a task is reopened
+    created_at = Column(DateTime, default=datetime.datetime.now)
+    completed_at = Column(DateTime)
 
     project = relationship("Project", back_populates="tasks")
     employees = relationship("Employee", secondary=employee_task, back_populates="tasks")
 
-    
+    # Completion is never indexed on its own: without statistics SQLite's
+    # planner would pick a bare boolean index over anything else and then
+    # sort. The project index carries it as a second column instead, and
+    # the partial index only matches queries filtering on "completed = 0",
+    # which is how Task.completed == False renders on SQLite.
+    __table_args__ = (
+        Index("ix_tasks_project_completed_deadline", "project_id", "completed", "deadline"),
+        Index("ix_tasks_open_deadline", "deadline", sqlite_where=text("completed = 0")),
+    )
+
+# Highest priority first, then earliest deadline and id (the implicit last
+# column), straight from the index. completed is left out: leading, it would
+# take over "completed = 0" plans as described above; trailing, it would sit
+# between deadline and the id and break the order.
+Index("ix_tasks_priority_deadline", Task.priority.desc(), Task.deadline)
+
+# Day buckets of a project's tasks for burndown, which counts tasks per
+# project and day from these. Partial, so that plain project_id lookups,
+# which only match them when filtering on the timestamp, keep using
+# ix_tasks_project_completed_deadline.
+Index("ix_tasks_project_created_day", Task.project_id, func.date(Task.created_at),
+      sqlite_where=Task.created_at.is_not(None))
+Index("ix_tasks_project_completed_day", Task.project_id, func.date(Task.completed_at),
+      sqlite_where=Task.completed_at.is_not(None))
+
+event.listen(task_totals, "after_create", DDL("INSERT INTO task_totals (id, task_count, completed_count) VALUES (1, 0, 0)"))
+event.listen(data_version, "after_create", DDL("INSERT INTO data_version (id, version) VALUES (1, 0)"))
+event.listen(journal_state, "after_create", DDL("INSERT INTO journal_state (id, generation, position) VALUES (1, '', 0)"))
+for statement in COUNTER_TRIGGERS + DATA_VERSION_TRIGGERS + HISTORY_TRIGGERS + TIMESTAMP_TRIGGERS + SEARCH_DDL:
+    # DDL() applies %-formatting to the statement; strftime() needs literal %
+    event.listen(Base.metadata, "after_create", DDL(statement.replace("%", "%%")).execute_if(dialect="sqlite"))
@@ -0,0 +1,136 @@
+"""Keyset (seek) pagination for the list commands.
+
+A page is fetched with WHERE (sort key, id) > (last row's values) ORDER BY
+sort key, id LIMIT n, so every page is an index range scan starting where
+the previous one stopped; page 10,000 costs the same as page 1, unlike
+OFFSET which reads and discards every earlier row.
+
+The --after cursor is the last row's sort key encoded as URL-safe base64
+JSON. It is opaque to users and only valid for the sort it came from.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from sqlalchemy import DateTime, and_, or_, false, tuple_
+
+
+class Ordering:
+    """A stable sort order: key columns ending in a unique one (the id).
+
+    descending is one flag for all keys or a tuple with one per key. NULLs
+    sort first ascending and last descending, as in SQLite.
+    """
+
+    def __init__(self, *columns, descending=False):
+        self.columns = columns
+        if isinstance(descending, bool):
+            descending = (descending,) * len(columns)
+        self.descending = descending
+
+    def order_by(self, columns=None):
+        return [
+            column.desc() if desc else column
+            for column, desc in zip(columns or self.columns, self.descending)
+        ]
+
+    def seek(self, values):
+        """Disjoint WHERE clauses, in sort order, for the rows after values.
+
+        Keys run in groups of one direction. Each group contributes one
+        clause: the earlier groups equal to the cursor and this group past
+        it, so each clause is a single index range. A single-direction
+        order is one clause.
+        """
+        groups = []
+        for column, desc, value in zip(self.columns, self.descending, values):
+            if groups and groups[-1][0] == desc:
+                groups[-1][1].append(column)
+                groups[-1][2].append(value)
+            else:
+                groups.append((desc, [column], [value]))
+        clauses = []
+        for index, (desc, columns, group_values) in enumerate(groups):
+            equal = [
+                column.is_(None) if value is None else column == value
+                for _, earlier_columns, earlier_values in groups[:index]
+                for column, value in zip(earlier_columns, earlier_values)
+            ]
+            clauses.append(and_(*equal, self._after(columns, group_values, desc)))
+        return clauses[::-1]
+
+    def _after(self, columns, values, desc):
+        if not columns:
+            return false()
+        if values[0] is None:
+            # Within the NULL run the remaining keys decide; ascending, every
+            # non-NULL row follows too
+            rest = and_(columns[0].is_(None), self._after(columns[1:], values[1:], desc))
+            return rest if desc else or_(rest, columns[0].is_not(None))
+        # Row values compare lexicographically and SQLite turns them into an
+        # index range; a NULL column compares as unknown and drops out
+        keys = tuple_(*columns) if len(columns) > 1 else columns[0]
+        bound = tuple_(*values) if len(values) > 1 else values[0]
+        if not desc:
+            return keys > bound
+        if columns[0].nullable:
+            return or_(keys < bound, columns[0].is_(None))
+        return keys < bound
+
+    def values(self, row):
+        return [getattr(row, column.key) for column in self.columns]
+
+
+def encode_cursor(sort, values):
+    payload = json.dumps({"sort": sort, "key": [
+        value.isoformat() if isinstance(value, datetime) else value for value in values
+    ]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, sort, ordering):
+    """Key values stored in a cursor; ValueError if it is malformed or
+    was produced for another sort order."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        values = payload["key"]
+        cursor_sort = payload["sort"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ValueError("not a valid cursor")
+    if cursor_sort != sort:
+        raise ValueError(f"cursor is for --sort {cursor_sort}, not --sort {sort}")
+    if not isinstance(values, list) or len(values) != len(ordering.columns):
+        raise ValueError("not a valid cursor")
+    try:
+        return [
+            datetime.fromisoformat(value) if value is not None and isinstance(column.type, DateTime) else value
+            for column, value in zip(ordering.columns, values)
+        ]
+    except (TypeError, ValueError):
+        raise ValueError("not a valid cursor")
+
+
+def list_page(orderings, sort, after, limit, build_query, describe, error):
+    """Print one keyset page and the cursor of the next one, if any"""
+    import click
+    from database import sessionLocal
+    from queries import page_query
+    ordering = orderings[sort]
+    if after is not None:
+        try:
+            after = decode_cursor(after, sort, ordering)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="'--after'")
+    session = sessionLocal()
+    try:
+        rows = session.execute(page_query(build_query(), ordering, after, limit)).all()
+        if not rows:
+            click.echo("Nothing found.")
+        for row in rows[:limit]:
+            click.echo(describe(row))
+        if len(rows) > limit:
+            click.echo(f"Next page: --after {encode_cursor(sort, ordering.values(rows[limit - 1]))}")
+    except Exception as e:
+        click.echo(f"{error}: {e}")
+    finally:
+        session.close()
@@ -0,0 +1,136 @@
+import sqlite3
+import time
+from collections import defaultdict
+import click
+from sqlalchemy import event
+
+# How many entries to show in each section of the summary
+SUMMARY_LIMIT = 5
+
+
+class CountingCursor(sqlite3.Cursor):
+    """sqlite3 cursor that tallies fetched rows onto the current statement"""
+    stat = None
+
+    def _count(self, rows):
+        if self.stat is not None:
+            self.stat.rows += rows
+        return rows
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            self._count(1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._count(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        self._count(len(rows))
+        return rows
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """sqlite3 connection handing out CountingCursor instances"""
+
+    def cursor(self, factory=CountingCursor):
+        return super().cursor(factory)
+
+
+class StatementStat:
+    def __init__(self, statement, elapsed, rows):
+        self.statement = statement
+        self.elapsed = elapsed
+        self.rows = rows
+
+
+class QueryProfiler:
+    """Records every statement an engine executes while installed.
+
+    Timing comes from the before/after_cursor_execute engine events. Rows
+    affected by DML are read from cursor.rowcount, rows returned by SELECTs
+    are counted by the CountingCursor as they are fetched.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.stats = []
+        self.started = None
+
+    def install(self):
+        # Pooled connections were opened without the counting factory
+        self.engine.dispose()
+        event.listen(self.engine, "do_connect", self._do_connect)
+        event.listen(self.engine, "before_cursor_execute", self._before_execute)
+        event.listen(self.engine, "after_cursor_execute", self._after_execute)
+        self.started = time.perf_counter()
+
+    def remove(self):
+        event.remove(self.engine, "do_connect", self._do_connect)
+        event.remove(self.engine, "before_cursor_execute", self._before_execute)
+        event.remove(self.engine, "after_cursor_execute", self._after_execute)
+        self.engine.dispose()
+
+    def _do_connect(self, dialect, conn_rec, cargs, cparams):
+        if self.engine.dialect.name == "sqlite":
+            cparams.setdefault("factory", ProfiledConnection)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profile_start", []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["profile_start"].pop()
+        stat = StatementStat(statement, elapsed, max(cursor.rowcount, 0))
+        self.stats.append(stat)
+        if isinstance(cursor, CountingCursor):
+            cursor.stat = stat
+
+    def summary(self):
+        """Return the profile as a dict of totals plus ranked statements"""
+        total = time.perf_counter() - self.started
+        by_statement = defaultdict(list)
+        for stat in self.stats:
+            by_statement[stat.statement].append(stat)
+        duplicates = sorted(
+            ((statement, stats) for statement, stats in by_statement.items() if len(stats) > 1),
+            key=lambda item: len(item[1]),
+            reverse=True,
+        )
+        return {
+            "statements": len(self.stats),
+            "rows": sum(stat.rows for stat in self.stats),
+            "sql_time": sum(stat.elapsed for stat in self.stats),
+            "total_time": total,
+            "slowest": sorted(self.stats, key=lambda stat: stat.elapsed, reverse=True)[:SUMMARY_LIMIT],
+            "duplicates": duplicates[:SUMMARY_LIMIT],
+        }
+
+    def report(self):
+        """Print the summary to stderr and detach from the engine"""
+        self.remove()
+        summary = self.summary()
+        click.echo("-- profile --", err=True)
+        click.echo(
+            f"{summary['statements']} statements, {summary['rows']} rows, "
+            f"SQL {summary['sql_time'] * 1000:.1f} ms of {summary['total_time'] * 1000:.1f} ms total",
+            err=True,
+        )
+        if summary["slowest"]:
+            click.echo("Slowest statements:", err=True)
+            for stat in summary["slowest"]:
+                click.echo(f"  {stat.elapsed * 1000:8.2f} ms {stat.rows:8d} rows  {shorten(stat.statement)}", err=True)
+        if summary["duplicates"]:
+            click.echo("Repeated statements (possible N+1):", err=True)
+            for statement, stats in summary["duplicates"]:
+                elapsed = sum(stat.elapsed for stat in stats)
+                click.echo(f"  {len(stats):5d}x {elapsed * 1000:8.2f} ms  {shorten(statement)}", err=True)
+
+
+def shorten(statement, width=100):
+    """Collapse a SQL statement onto one line for the summary"""
+    text = " ".join(statement.split())
+    return text if len(text) <= width else text[:width - 3] + "..."
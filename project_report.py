@@ -0,0 +1,108 @@
+"""Per-project completion report, optionally spread over worker processes.
+
+generate-report --per-project prints every project's completion and each
+assigned employee's share of it. Projects are cut into contiguous id
+ranges holding about the same number of tasks, read from the task_count
+counters, several per job so a few huge projects cannot leave workers
+idle. With --jobs N a pool of N processes renders the ranges; each worker
+opens its own read-only connection to the database file, which WAL mode
+lets run alongside the parent and any writer. Pool.imap returns the
+rendered ranges in order, so the output is the same for every N.
+
+Each range is read in one transaction; a write landing while the report
+runs may show in later ranges only.
+"""
+import multiprocessing
+from urllib.parse import quote
+from sqlalchemy import create_engine, event
+from database import set_sqlite_pragmas
+
+# Ranges per job; more balance load better, fewer cost fewer queries
+RANGES_PER_JOB = 8
+
+# The read-only engine of this worker process, set by init_worker
+_engine = None
+
+
+def read_only_engine(path):
+    """Engine on a SQLite file opened with mode=ro, with the read-safe
+    pragmas of the current profile"""
+    engine = create_engine(f"sqlite:///file:{quote(path)}?mode=ro&uri=true")
+    event.listen(engine, "connect", lambda dbapi_connection, connection_record: set_sqlite_pragmas(dbapi_connection, read_only=True))
+    return engine
+
+
+def partition(counts, parts):
+    """Split (project id, task count) rows in id order into at most parts
+    contiguous (first id, last id) ranges of about equal task counts"""
+    counts = list(counts)
+    total = sum(count for _, count in counts) or 1
+    target = total / parts
+    ranges, first, filled = [], None, 0
+    for project_id, count in counts:
+        if first is None:
+            first = project_id
+        # Projects without tasks still cost a line each
+        filled += count or 1
+        if filled >= target:
+            ranges.append((first, project_id))
+            first, filled = None, 0
+    if first is not None:
+        ranges.append((first, counts[-1][0]))
+    return ranges
+
+
+def init_worker(path):
+    global _engine
+    _engine = read_only_engine(path)
+
+
+def render_range(bounds):
+    """The report lines of the projects in one id range, as one string"""
+    from itertools import groupby
+    from operator import itemgetter
+    from queries import project_totals_query, project_employee_report_query
+    first_id, last_id = bounds
+    lines = []
+    with _engine.connect() as conn, conn.begin():
+        projects = conn.execute(project_totals_query(first_id, last_id)).all()
+        shares = groupby(conn.execute(project_employee_report_query(first_id, last_id)), key=itemgetter(0))
+        project_id, employees = next(shares, (None, ()))
+        for proj_id, name, total, completed in projects:
+            lines.append(f"Project {name} (ID: {proj_id}): {completed}/{total} tasks completed.")
+            # Skip shares of tasks whose project row is missing
+            while project_id is not None and project_id < proj_id:
+                project_id, employees = next(shares, (None, ()))
+            if project_id == proj_id:
+                lines.extend(
+                    f"  Employee {employee}: {done}/{assigned} tasks completed."
+                    for _, employee, assigned, done in employees
+                )
+                project_id, employees = next(shares, (None, ()))
+    return "\n".join(lines)
+
+
+def project_report(path, jobs=1):
+    """Yield the report of every project as blocks of lines, in id order.
+
+    The ranges are planned on the read-write engine of database.py, whose
+    pragmas switch the file to WAL mode before any worker reads it. With
+    jobs > 1 the blocks are rendered by a process pool; that connection
+    is closed before the pool starts, so no worker inherits it.
+    """
+    from database import engine
+    from queries import project_task_counts_query
+    try:
+        with engine.connect() as conn:
+            ranges = partition(conn.execute(project_task_counts_query()), jobs * RANGES_PER_JOB)
+    finally:
+        engine.dispose()
+    if jobs == 1:
+        init_worker(path)
+        try:
+            yield from (block for block in map(render_range, ranges) if block)
+        finally:
+            _engine.dispose()
+        return
+    with multiprocessing.Pool(jobs, initializer=init_worker, initargs=(path,)) as pool:
+        yield from (block for block in pool.imap(render_range, ranges) if block)
@@ -0,0 +1,548 @@
+from sqlalchemy import select, update, union_all, func, case, and_, or_, true, table, column, literal, literal_column
+from datetime import datetime, timedelta
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import Project, Employee, Task, employee_task, task_dependencies, task_totals, data_version, task_events
+from pagination import Ordering
+
+# Rows fetched per round trip when streaming report output
+STREAM_BATCH_SIZE = 1000
+
+def no_later_event(as_of, same):
+    """Clause keeping a task event only if no event of the same series
+    (same(later) on the same task) follows it up to as_of.
+
+    "Follows" compares (occurred_at, id): flush dates the events of
+    journaled writes at their queued time, so ids alone do not grow with
+    time. Each check is a seek on ix_task_events_task_occurred.
+    """
+    later = task_events.alias('later')
+    return ~select(literal(1)).where(
+        later.c.task_id == task_events.c.task_id, same(later), later.c.occurred_at <= as_of,
+        or_(later.c.occurred_at > task_events.c.occurred_at,
+            and_(later.c.occurred_at == task_events.c.occurred_at, later.c.id > task_events.c.id)),
+    ).exists()
+
+def tasks_as_of(as_of):
+    """Subquery of (task_id, project_id, priority, deadline, completed) for
+    every task that existed at as_of.
+
+    Each task's state is its latest task event up to then rather than a
+    replay of its history.
+    """
+    return (
+        select(task_events.c.task_id, task_events.c.project_id, task_events.c.priority,
+               task_events.c.deadline, task_events.c.completed)
+        .where(task_events.c.occurred_at <= as_of, task_events.c.employee_id.is_(None),
+               no_later_event(as_of, lambda later: later.c.employee_id.is_(None)),
+               task_events.c.event != 'deleted')
+        .subquery('tasks_as_of')
+    )
+
+def assignments_as_of(as_of):
+    """Subquery of (employee_id, task_id) for every assignment in place at
+    as_of: pairs whose latest assignment event up to then assigned them"""
+    return (
+        select(task_events.c.employee_id, task_events.c.task_id)
+        .where(task_events.c.occurred_at <= as_of, task_events.c.employee_id.is_not(None),
+               no_later_event(as_of, lambda later: later.c.employee_id == task_events.c.employee_id),
+               task_events.c.event == 'assigned')
+        .subquery('assignments_as_of')
+    )
+
+def workload_query(sort='id', top=None, min_tasks=None, as_of=None):
+    """Build the per-employee task count query used by view-workload.
+
+    Reads the task_count column the counter triggers keep current, so no
+    aggregation over employee_task happens at read time. With as_of the
+    counts are those of that moment, from the task history.
+    """
+    if as_of is None:
+        task_count = Employee.task_count
+        stmt = select(Employee.id, Employee.name, task_count)
+        if min_tasks is not None:
+            stmt = stmt.where(task_count >= min_tasks)
+    else:
+        assigned = assignments_as_of(as_of)
+        counts = (
+            select(assigned.c.employee_id, func.count().label('task_count'))
+            .group_by(assigned.c.employee_id)
+            .subquery()
+        )
+        task_count = func.coalesce(counts.c.task_count, 0)
+        stmt = (
+            select(Employee.id, Employee.name, task_count)
+            .outerjoin(counts, counts.c.employee_id == Employee.id)
+        )
+        if min_tasks is not None:
+            stmt = stmt.where(task_count >= min_tasks)
+    if sort == 'name':
+        stmt = stmt.order_by(Employee.name, Employee.id)
+    elif sort == 'tasks':
+        stmt = stmt.order_by(task_count.desc(), Employee.id)
+    else:
+        stmt = stmt.order_by(Employee.id)
+    if top is not None:
+        stmt = stmt.limit(top)
+    return stmt
+
+def completed_count(column):
+    """SUM(CASE completed) as a NULL-safe integer"""
+    return func.coalesce(func.sum(case((column, 1), else_=0)), 0)
+
+def task_totals_query(as_of=None):
+    """Total and completed task counts from the single task_totals row, or
+    counted from the task history as of a moment"""
+    if as_of is not None:
+        tasks = tasks_as_of(as_of)
+        return select(func.count(tasks.c.task_id), completed_count(tasks.c.completed))
+    return select(task_totals.c.task_count, task_totals.c.completed_count).where(task_totals.c.id == 1)
+
+def employee_report_query(as_of=None):
+    """Assigned and completed task counts per employee, streamed in id order.
+
+    With as_of they are counted from the assignments and task states of
+    that moment; like the counters, an assignment of a deleted task still
+    counts as assigned but not as completed.
+    """
+    if as_of is None:
+        stmt = select(
+            Employee.name,
+            Employee.task_count.label('assigned'),
+            Employee.completed_count.label('completed'),
+        )
+    else:
+        # Counted per employee first and then joined, so the employees
+        # scan does not drive a lookup into the history for each one
+        assigned, tasks = assignments_as_of(as_of), tasks_as_of(as_of)
+        counts = (
+            select(
+                assigned.c.employee_id,
+                func.count().label('assigned'),
+                completed_count(tasks.c.completed).label('completed'),
+            )
+            .outerjoin(tasks, tasks.c.task_id == assigned.c.task_id)
+            .group_by(assigned.c.employee_id)
+            .subquery()
+        )
+        stmt = (
+            select(
+                Employee.name,
+                func.coalesce(counts.c.assigned, 0).label('assigned'),
+                func.coalesce(counts.c.completed, 0).label('completed'),
+            )
+            .outerjoin(counts, counts.c.employee_id == Employee.id)
+        )
+    return stmt.order_by(Employee.id).execution_options(yield_per=STREAM_BATCH_SIZE)
+
+def project_task_counts_query():
+    """(project id, task count) of every project in id order, from the
+    counters; generate-report --per-project splits its work by these"""
+    return select(Project.id, Project.task_count).order_by(Project.id)
+
+def project_totals_query(first_id, last_id):
+    """Task and completed counts of the projects with ids in [first_id, last_id]"""
+    return (
+        select(Project.id, Project.name, Project.task_count, Project.completed_count)
+        .where(Project.id.between(first_id, last_id))
+        .order_by(Project.id)
+    )
+
+def project_employee_report_query(first_id, last_id):
+    """Assigned and completed task counts per project and employee for the
+    projects with ids in [first_id, last_id], by project then employee id"""
+    return (
+        select(
+            Task.project_id,
+            Employee.name,
+            func.count().label('assigned'),
+            completed_count(Task.completed).label('completed'),
+        )
+        .join(employee_task, employee_task.c.task_id == Task.id)
+        .join(Employee, Employee.id == employee_task.c.employee_id)
+        .where(Task.project_id.between(first_id, last_id))
+        .group_by(Task.project_id, Employee.id)
+        .order_by(Task.project_id, Employee.id)
+    )
+
+def rebuild_counter_statements():
+    """UPDATEs recomputing every materialized counter from the base tables.
+
+    Used by rebuild-counters to repair counters after writes that bypassed
+    the triggers, e.g. rows loaded with the sqlite3 shell's .import.
+    """
+    project_tasks = select(func.count(Task.id)).where(Task.project_id == Project.id)
+    project_completed = select(completed_count(Task.completed)).where(Task.project_id == Project.id)
+    assigned = select(func.count(employee_task.c.task_id)).where(employee_task.c.employee_id == Employee.id)
+    assigned_completed = (
+        select(completed_count(Task.completed))
+        .join(employee_task, employee_task.c.task_id == Task.id)
+        .where(employee_task.c.employee_id == Employee.id)
+    )
+    return [
+        update(Project.__table__).values(
+            task_count=project_tasks.scalar_subquery(),
+            completed_count=project_completed.scalar_subquery(),
+        ),
+        update(Employee.__table__).values(
+            task_count=assigned.scalar_subquery(),
+            completed_count=assigned_completed.scalar_subquery(),
+        ),
+        update(task_totals).where(task_totals.c.id == 1).values(
+            task_count=select(func.count(Task.id)).scalar_subquery(),
+            completed_count=select(completed_count(Task.completed)).scalar_subquery(),
+        ),
+        # Counter changes alone do not bump the version, but reports show them
+        update(data_version).where(data_version.c.id == 1).values(version=data_version.c.version + 1),
+    ]
+
+def id_spec_clause(column, spec):
+    """WHERE clause matching the ids of an idspec.IdSpec"""
+    if spec.everything:
+        return true()
+    clauses = [column.between(low, high) for low, high in spec.ranges]
+    if spec.ids:
+        clauses.append(column.in_(spec.ids))
+    return or_(*clauses)
+
+def id_part_clause(column, part):
+    """WHERE clause matching one of idspec.IdSpec.parts()"""
+    if isinstance(part, range):
+        return column.between(part.start, part.stop - 1)
+    return column.in_(part)
+
+def missing_ranges_query(column, low, high, clauses, limit):
+    """The first limit gaps (first id, last id) in the ids of [low, high]
+    matching clauses, up to the last such id.
+
+    The rows are walked in id order with lag(), so a range of millions of
+    ids is checked by SQLite without being expanded anywhere.
+    """
+    ids = (
+        select(column.label('id'), func.lag(column, 1, low - 1).over(order_by=column).label('previous'))
+        .where(column.between(low, high), *clauses)
+        .subquery()
+    )
+    return (
+        select(ids.c.previous + 1, ids.c.id - 1)
+        .where(ids.c.id > ids.c.previous + 1)
+        .order_by(ids.c.id)
+        .limit(limit)
+    )
+
+def task_selection(task_spec=None, project_id=None, assignee_id=None, deadline_before=None):
+    """WHERE clauses selecting tasks by ids, project, assignee and deadline"""
+    clauses = []
+    if task_spec is not None:
+        clauses.append(id_spec_clause(Task.id, task_spec))
+    if project_id is not None:
+        clauses.append(Task.project_id == project_id)
+    if assignee_id is not None:
+        assigned = select(employee_task.c.task_id).where(employee_task.c.employee_id == assignee_id)
+        clauses.append(Task.id.in_(assigned))
+    if deadline_before is not None:
+        clauses.append(Task.deadline < deadline_before)
+    return clauses
+
+def deadline_filters(column, deadline_from=None, deadline_to=None):
+    filters = []
+    if deadline_from is not None:
+        filters.append(column >= deadline_from)
+    if deadline_to is not None:
+        # --deadline-to is inclusive of the whole day
+        filters.append(column < deadline_to + timedelta(days=1))
+    return filters
+
+def set_completion_statement(task_clauses, completed, at=None):
+    """Single UPDATE flipping completion for the selected tasks.
+
+    Rows already in the target state are excluded so the rowcount is the
+    number of tasks that actually changed. Completing stamps completed_at
+    with at (default now), reopening clears it.
+    """
+    return (
+        update(Task.__table__)
+        .where(*task_clauses, Task.completed.is_not(completed))
+        .values(completed=completed, completed_at=(at or datetime.now()) if completed else None)
+    )
+
+def bulk_assign_statement(task_clauses, employee_clause):
+    """INSERT every (employee, task) pair of the selections in one statement.
+
+    Pairs that already exist are skipped by ON CONFLICT DO NOTHING, so
+    re-running an assignment is harmless. The SELECT always carries a WHERE
+    clause, which SQLite needs to parse an upsert on INSERT ... SELECT.
+    """
+    pairs = (
+        select(Employee.id, Task.id)
+        .join(Task, true())  # deliberate cross join of the two selections
+        .where(employee_clause, *task_clauses)
+    )
+    return (
+        sqlite_insert(employee_task)
+        .from_select(['employee_id', 'task_id'], pairs)
+        .on_conflict_do_nothing()
+    )
+
+def add_dependencies_statement(task_id, task_clauses):
+    """INSERT the edges task_id -> each selected task, skipping existing ones"""
+    prerequisites = select(literal(task_id), Task.id).where(*task_clauses)
+    return (
+        sqlite_insert(task_dependencies)
+        .from_select(['task_id', 'depends_on_id'], prerequisites)
+        .on_conflict_do_nothing()
+    )
+
+def reaches_query(task_clauses, target_id):
+    """Whether target_id is a transitive prerequisite of any selected task.
+
+    Walks the edges with a recursive CTE over the primary key (task_id
+    leading), so only the prerequisites reachable from the selection are
+    read.
+    """
+    upstream = (
+        select(task_dependencies.c.depends_on_id.label('id'))
+        .where(task_dependencies.c.task_id.in_(select(Task.id).where(*task_clauses)))
+        .cte('upstream', recursive=True)
+    )
+    upstream = upstream.union(
+        select(task_dependencies.c.depends_on_id)
+        .join(upstream, task_dependencies.c.task_id == upstream.c.id)
+    )
+    return select(select(upstream.c.id).where(upstream.c.id == target_id).exists())
+
+def project_graph_query(project_id):
+    """Every task of a project with its duration and its prerequisites as
+    comma-separated ids (NULL if none).
+
+    One row per task rather than per edge: the prerequisites come from the
+    primary key of task_dependencies, and turning a million edge rows into
+    Row objects would cost several times what the query does.
+    """
+    prerequisites = (
+        select(func.group_concat(task_dependencies.c.depends_on_id))
+        .where(task_dependencies.c.task_id == Task.id)
+        .scalar_subquery()
+    )
+    return select(Task.id, Task.duration_days, prerequisites).where(Task.project_id == project_id)
+
+# FTS5 tables created by triggers.SEARCH_DDL; not mapped, so declared here
+tasks_fts = table('tasks_fts', column('rowid'), column('rank'))
+projects_fts = table('projects_fts', column('rowid'), column('rank'))
+
+def fts_match(fts, match, highlight, tokens=12):
+    """MATCH clause plus the snippet column of the best matching column"""
+    name = literal_column(fts.name)
+    snippet = func.snippet(name, -1, highlight[0], highlight[1], '...', tokens).label('snippet')
+    return name.match(match), snippet
+
+def task_search_query(match, project_id=None, priority=None, completed=None, limit=20, highlight=('[', ']')):
+    """Tasks matching an FTS5 query, best bm25 rank first.
+
+    The MATCH drives the plan: matching rowids come from the index and
+    only those tasks are looked up by primary key and filtered.
+    """
+    clause, snippet = fts_match(tasks_fts, match, highlight)
+    stmt = (
+        select(Task.id, Task.title, Task.priority, Task.completed, Project.name, snippet)
+        .select_from(tasks_fts)
+        .join(Task, Task.id == tasks_fts.c.rowid)
+        .outerjoin(Project, Project.id == Task.project_id)
+        .where(clause)
+    )
+    if project_id is not None:
+        stmt = stmt.where(Task.project_id == project_id)
+    if priority is not None:
+        stmt = stmt.where(Task.priority == priority)
+    if completed is not None:
+        stmt = stmt.where(Task.completed == completed)
+    return stmt.order_by(tasks_fts.c.rank).limit(limit)
+
+def project_search_query(match, limit=20, highlight=('[', ']')):
+    """Projects matching an FTS5 query, best bm25 rank first"""
+    clause, snippet = fts_match(projects_fts, match, highlight)
+    return (
+        select(Project.id, Project.name, snippet)
+        .select_from(projects_fts)
+        .join(Project, Project.id == projects_fts.c.rowid)
+        .where(clause)
+        .order_by(projects_fts.c.rank)
+        .limit(limit)
+    )
+
+# Sort orders of the list commands, each ending in the unique id. Every
+# one is served by an index, so a page never sorts the table.
+PROJECT_ORDERINGS = {
+    'id': Ordering(Project.id),
+    'name': Ordering(Project.name, Project.id),
+    'deadline': Ordering(Project.deadline, Project.id),
+}
+TASK_ORDERINGS = {
+    'id': Ordering(Task.id),
+    'deadline': Ordering(Task.deadline, Task.id),
+    # Highest priority first, then earliest deadline
+    'priority': Ordering(Task.priority, Task.deadline, Task.id, descending=(True, False, False)),
+}
+EMPLOYEE_ORDERINGS = {
+    'id': Ordering(Employee.id),
+    'name': Ordering(Employee.name, Employee.id),
+    'tasks': Ordering(Employee.task_count, Employee.id, descending=True),
+}
+
+def page_query(stmt, ordering, after=None, limit=50):
+    """One keyset page of stmt; fetches limit + 1 rows to tell if more follow"""
+    if after is None:
+        return stmt.order_by(*ordering.order_by()).limit(limit + 1)
+    clauses = ordering.seek(after)
+    if len(clauses) == 1:
+        return stmt.where(clauses[0]).order_by(*ordering.order_by()).limit(limit + 1)
+    # Mixed directions: one index range per clause, combined with UNION ALL
+    # so SQLite merges the ranges in order instead of scanning from the start
+    ranges = union_all(*(stmt.where(clause) for clause in clauses)).subquery()
+    columns = [ranges.c[column.key] for column in ordering.columns]
+    return select(ranges).order_by(*ordering.order_by(columns)).limit(limit + 1)
+
+def list_projects_query(deadline_from=None, deadline_to=None):
+    return (
+        select(Project.id, Project.name, Project.deadline, Project.task_count, Project.completed_count)
+        .where(*deadline_filters(Project.deadline, deadline_from, deadline_to))
+    )
+
+def list_tasks_query(project_id=None, assignee_id=None, priority=None, completed=None, deadline_from=None, deadline_to=None):
+    stmt = (
+        select(Task.id, Task.title, Task.project_id, Task.priority, Task.deadline, Task.completed)
+        .where(*task_selection(project_id=project_id, assignee_id=assignee_id))
+        .where(*deadline_filters(Task.deadline, deadline_from, deadline_to))
+    )
+    if priority is not None:
+        stmt = stmt.where(Task.priority == priority)
+    if completed is not None:
+        stmt = stmt.where(Task.completed == completed)
+    return stmt
+
+def list_employees_query(role=None):
+    stmt = select(Employee.id, Employee.name, Employee.role, Employee.task_count, Employee.completed_count)
+    if role is not None:
+        stmt = stmt.where(Employee.role == role)
+    return stmt
+
+def open_window_clauses(start=None, end=None, project_id=None):
+    """Open tasks with start <= deadline < end.
+
+    completed == False renders as "completed = 0", matching the partial
+    index ix_tasks_open_deadline, so the window is a range scan over open
+    tasks only (or over ix_tasks_project_completed_deadline with a project).
+    """
+    clauses = [Task.completed == False]
+    if start is not None:
+        clauses.append(Task.deadline >= start)
+    if end is not None:
+        clauses.append(Task.deadline < end)
+    if project_id is not None:
+        clauses.append(Task.project_id == project_id)
+    return clauses
+
+def window_tasks_query(clauses, limit):
+    """Tasks in a deadline window, earliest deadline first"""
+    return (
+        select(Task.id, Task.title, Task.deadline, Task.priority, Project.name.label('project'))
+        .outerjoin(Project, Project.id == Task.project_id)
+        .where(*clauses)
+        .order_by(Task.deadline, Task.id)
+        .limit(limit)
+    )
+
+def window_count_query(clauses):
+    return select(func.count()).select_from(Task).where(*clauses)
+
+def window_groups_query(clauses, group_by, limit):
+    """Per-project or per-assignee counts and earliest deadline in a window.
+
+    Grouped by assignee, tasks nobody is assigned to form a group whose id
+    and name are NULL; a task with several assignees counts for each.
+    """
+    count = func.count(Task.id).label('tasks')
+    earliest = func.min(Task.deadline).label('earliest')
+    if group_by == 'project':
+        stmt = (
+            select(Task.project_id.label('id'), Project.name, count, earliest)
+            .outerjoin(Project, Project.id == Task.project_id)
+            .group_by(Task.project_id)
+        )
+    else:
+        stmt = (
+            select(employee_task.c.employee_id.label('id'), Employee.name, count, earliest)
+            .outerjoin(employee_task, employee_task.c.task_id == Task.id)
+            .outerjoin(Employee, Employee.id == employee_task.c.employee_id)
+            .group_by(employee_task.c.employee_id)
+        )
+    return stmt.where(*clauses).order_by(count.desc(), earliest).limit(limit)
+
+def unassigned_tasks_query(project_id=None):
+    """Ids and durations of open tasks nobody is assigned to, most urgent
+    first: highest priority, earliest deadline (none last), longest"""
+    assigned = select(employee_task.c.task_id).where(employee_task.c.task_id == Task.id).exists()
+    return (
+        select(Task.id, Task.duration_days)
+        .where(*open_window_clauses(project_id=project_id), ~assigned)
+        .order_by(Task.priority.desc(), Task.deadline.is_(None), Task.deadline, Task.duration_days.desc(), Task.id)
+    )
+
+def open_load_query(role=None):
+    """Days and number of open tasks assigned to each employee, in one
+    aggregate over the employee_task primary key"""
+    stmt = (
+        select(Employee.id, func.coalesce(func.sum(Task.duration_days), 0), func.count(Task.id))
+        .outerjoin(employee_task, employee_task.c.employee_id == Employee.id)
+        .outerjoin(Task, and_(Task.id == employee_task.c.task_id, Task.completed == False))
+        .group_by(Employee.id)
+    )
+    if role is not None:
+        stmt = stmt.where(Employee.role == role)
+    return stmt
+
+def burndown_query(project_id=None, period='day'):
+    """Tasks created, completed and remaining at the end of each day (or
+    week, from Monday) with any activity, per project, oldest first.
+
+    Creations and completions are counted per project and day straight
+    from the ix_tasks_project_*_day indexes; remaining is one running sum
+    over those counts, so the work grows with the number of active days
+    rather than with the number of tasks.
+    """
+    created_day = func.date(Task.created_at)
+    completed_day = func.date(Task.completed_at)
+    created = (
+        select(Task.project_id, created_day.label('day'), func.count().label('created'), literal(0).label('completed'))
+        .where(Task.created_at.is_not(None))
+        .group_by(Task.project_id, created_day)
+    )
+    completed = (
+        select(Task.project_id, completed_day.label('day'), literal(0).label('created'), func.count().label('completed'))
+        .where(Task.completed_at.is_not(None))
+        .group_by(Task.project_id, completed_day)
+    )
+    if project_id is not None:
+        created = created.where(Task.project_id == project_id)
+        completed = completed.where(Task.project_id == project_id)
+    days = union_all(created, completed).subquery('days')
+    bucket = days.c.day if period == 'day' else func.date(days.c.day, '-6 days', 'weekday 1')
+    created_count, completed_count = func.sum(days.c.created), func.sum(days.c.completed)
+    series = (
+        select(
+            days.c.project_id,
+            bucket.label('period'),
+            created_count.label('created'),
+            completed_count.label('completed'),
+            func.sum(created_count - completed_count)
+            .over(partition_by=days.c.project_id, order_by=bucket)
+            .label('remaining'),
+        )
+        .group_by(days.c.project_id, bucket)
+        .subquery('series')
+    )
+    return (
+        select(series.c.project_id, Project.name, series.c.period, series.c.created, series.c.completed, series.c.remaining)
+        .join(Project, Project.id == series.c.project_id)
+        .order_by(series.c.project_id, series.c.period)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
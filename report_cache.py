@@ -0,0 +1,182 @@
+"""Persistent cache of report output, keyed on the database's data version.
+
+Entries live in a small SQLite file next to the database
+(project_management.db -> project_management.db.cache) and are stored under
+the command, its arguments and the data_version counter that triggers bump
+on every write. A hit is therefore exactly what the report would print now.
+
+Only sqlite3 is imported here, so serving a hit never loads SQLAlchemy.
+Set PM_REPORT_CACHE=off to disable the cache and PM_REPORT_CACHE_MB to
+change its size bound.
+"""
+import json
+import os
+import sqlite3
+import time
+from choices import DEFAULT_DATABASE_URL
+
+# Bump when a report's output format changes so old entries stop matching
+CACHE_FORMAT = 1
+
+DEFAULT_MAX_MB = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    key TEXT PRIMARY KEY,
+    data_version INTEGER NOT NULL,
+    output TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_reports_used_at ON reports (used_at);
+"""
+
+
+def sqlite_path(url):
+    """File path of a sqlite:/// URL; None for other databases and :memory:"""
+    prefix = "sqlite:///"
+    if not url.startswith(prefix):
+        return None
+    path = url[len(prefix):].split("?", 1)[0]
+    return None if path in ("", ":memory:") else path
+
+
+class ReportCache:
+    """LRU-evicted store of report output for one database file.
+
+    The cache is best effort: any SQLite error while reading or writing it
+    is treated as a miss, never as a failed report.
+    """
+
+    def __init__(self, database, path, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.database = database
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn = None
+
+    @classmethod
+    def open(cls):
+        """The cache for $PM_DATABASE_URL, or None when caching is off"""
+        if os.environ.get("PM_REPORT_CACHE", "").lower() in ("off", "0", "no", "false"):
+            return None
+        database = sqlite_path(os.environ.get("PM_DATABASE_URL", DEFAULT_DATABASE_URL))
+        if database is None or not os.path.exists(database):
+            return None
+        max_mb = float(os.environ.get("PM_REPORT_CACHE_MB", DEFAULT_MAX_MB))
+        return cls(database, database + ".cache", int(max_mb * 1024 * 1024))
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            # The cache can always be rebuilt, so it skips fsync entirely
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=OFF")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def data_version(self):
+        """Current value of the database's write counter, None if unreadable"""
+        try:
+            conn = sqlite3.connect(self.database, timeout=5)
+            try:
+                row = conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            # e.g. a database not yet migrated to the data_version table
+            return None
+        return row[0] if row else None
+
+    def key(self, command, params):
+        """(key, data version) for a report, or None if it cannot be cached.
+
+        Read before the report runs: a write landing while it runs bumps the
+        version past this key, so the stored output is never served stale.
+        """
+        version = self.data_version()
+        if version is None:
+            return None
+        key = json.dumps([CACHE_FORMAT, command, params, version], sort_keys=True, default=str)
+        return key, version
+
+    def get(self, key):
+        try:
+            row = self.conn.execute("SELECT output FROM reports WHERE key = ?", (key[0],)).fetchone()
+            if row is not None:
+                self.conn.execute("UPDATE reports SET used_at = ? WHERE key = ?", (time.time(), key[0]))
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def put(self, key, output):
+        size = len(output.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        try:
+            with self.conn:
+                self.conn.execute("BEGIN IMMEDIATE")
+                # Entries of older data versions can never be hit again
+                self.conn.execute("DELETE FROM reports WHERE data_version < ?", (key[1],))
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO reports (key, data_version, output, size, used_at) VALUES (?, ?, ?, ?, ?)",
+                    (key[0], key[1], output, size, time.time()),
+                )
+                self._evict()
+        except sqlite3.Error:
+            pass
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits max_bytes"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM reports").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self.conn.execute("SELECT key, size FROM reports ORDER BY used_at"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self.conn.executemany("DELETE FROM reports WHERE key = ?", doomed)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def run_report(command, params, lines, error, no_cache):
+    """Echo a report's lines, serving them from the report cache when possible
+
+    lines(session) yields the output lines. On a miss they are echoed as
+    they stream and stored once the report completes.
+    """
+    import click
+    from database import sessionLocal
+    cache = None if no_cache else ReportCache.open()
+    key = cache.key(command, params) if cache else None
+    try:
+        cached = cache.get(key) if key else None
+        if cached is not None:
+            click.echo(cached, nl=False)
+            return
+        output, size = ([] if key else None), 0
+        session = sessionLocal()
+        try:
+            for line in lines(session):
+                click.echo(line)
+                if output is not None:
+                    output.append(line + "\n")
+                    size += len(line) + 1
+                    if size > cache.max_bytes:
+                        # Too large to cache; stop holding it in memory
+                        output = None
+            if output is not None:
+                cache.put(key, "".join(output))
+        except Exception as e:
+            click.echo(f"{error}: {e}")
+        finally:
+            session.close()
+    finally:
+        if cache:
+            cache.close()
@@ -0,0 +1,30 @@
+"""Greedy load balancing for auto-assign.
+
+Each employee's load is the days of open work already assigned to them.
+Tasks are handed out most urgent first (priority, then deadline) and,
+within the same urgency, longest first as in LPT scheduling; each goes to
+the employee with the least load at that moment, kept at the top of a heap,
+so n tasks over m employees cost O(n log m).
+"""
+import heapq
+
+
+def balance(tasks, loads):
+    """Assign tasks to employees, least loaded first.
+
+    tasks yields (task id, duration in days) in the order to hand them out;
+    loads yields (employee id, open days, open tasks). Ties on days go to
+    the employee with fewer open tasks, so zero-day tasks still spread out.
+    Returns ([(employee id, task id)], [(days, tasks, employee id)]) with
+    the final load of every employee.
+    """
+    heap = [(days, count, employee_id) for employee_id, days, count in loads]
+    heapq.heapify(heap)
+    pairs = []
+    if not heap:
+        return pairs, heap
+    for task_id, duration in tasks:
+        days, count, employee_id = heap[0]
+        pairs.append((employee_id, task_id))
+        heapq.heapreplace(heap, (days + duration, count + 1, employee_id))
+    return pairs, heap
@@ -0,0 +1,33 @@
+"""search: full-text search over tasks or projects (FTS5, see triggers.py)."""
+import click
+from database import sessionLocal
+from queries import task_search_query, project_search_query
+
+# Bold on/off around search matches; click.echo drops them when not a tty
+HIGHLIGHT = ('\x1b[1m', '\x1b[22m')
+
+
+def show_search(query, scope, project_id, priority, completed, limit):
+    """Body of search"""
+    session = sessionLocal()
+    try:
+        if scope == 'projects':
+            rows = session.execute(project_search_query(query, limit=limit, highlight=HIGHLIGHT)).all()
+            for proj_id, name, snippet in rows:
+                click.echo(f"Project {name} (ID: {proj_id})")
+                click.echo(f"    {snippet}")
+        else:
+            stmt = task_search_query(query, project_id, priority, completed, limit=limit, highlight=HIGHLIGHT)
+            rows = session.execute(stmt).all()
+            for task_id, title, task_priority, done, project_name, snippet in rows:
+                status = "completed" if done else "open"
+                where = f" in {project_name}" if project_name else ""
+                click.echo(f"Task {title} (ID: {task_id}){where}, {task_priority}, {status}")
+                click.echo(f"    {snippet}")
+        if not rows:
+            click.echo(f"No matching {scope}.")
+    except Exception as e:
+        # FTS5 syntax errors are the common case; show them without the SQL
+        click.echo(f"Error searching: {getattr(e, 'orig', None) or e}")
+    finally:
+        session.close()
@@ -0,0 +1,378 @@
+"""HTTP/JSON API over the models, served from one asyncio process.
+
+    python main.py serve --port 8080 --pool-size 5
+
+Callers that would otherwise start `python main.py ...` per request pay
+for interpreter start-up, imports and a new connection every time; here
+they only pay for the queries. Endpoints, all JSON in and out:
+
+    POST /projects     {"name", "description"?, "deadline"?}
+    POST /tasks        {"project_id", "title", "description"?, "deadline"?,
+                        "priority"?, "duration_days"?}
+    POST /employees    {"name", "role"}
+    POST /assignments  {"task_ids", "employee_ids", "project_id"?}
+    GET  /workload     ?sort=id|name|tasks&top=N&min_tasks=N
+    GET  /report
+
+task_ids and employee_ids take what assign-employee does: an id, a list,
+a string such as "1,4,10-20", or "all". Errors come back as
+{"error": message} with a 4xx/5xx status.
+
+The HTTP side is a small HTTP/1.1 implementation on asyncio streams
+(keep-alive, Content-Length bodies), so the only extra dependency is the
+aiosqlite driver behind SQLAlchemy's async engine. Requests share a pool
+of at most --pool-size connections; writes also take a process-wide lock,
+since SQLite runs one writer at a time and a read transaction upgraded to
+a write would otherwise fail with SQLITE_BUSY instead of waiting. Every
+response carries Server-Timing with the time spent waiting for a
+connection, using it, and in total, in milliseconds.
+"""
+import asyncio
+import contextlib
+import json
+import time
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
+import click
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+import database
+from models import Project, Task, Employee
+from queries import (
+    workload_query, task_totals_query, employee_report_query,
+    id_spec_clause, task_selection, bulk_assign_statement,
+)
+from choices import PRIORITIES, WORKLOAD_SORTS, Priority
+from idspec import parse_id_spec, describe_missing, MAX_ID
+from assignments import find_existing
+from journal import Journal, Flusher
+
+# Larger request bodies are refused with 413
+MAX_BODY_BYTES = 1024 * 1024
+
+# Seconds a request waits for a pooled connection before failing
+POOL_TIMEOUT = 30
+
+REASONS = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 411: "Length Required", 413: "Payload Too Large",
+    431: "Request Header Fields Too Large", 500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    """Ends a request with this status and {"error": message}"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Timing:
+    """Wall time of one request, split into waiting for a connection (or the
+    write lock) and using it"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.wait = 0.0
+        self.db = 0.0
+
+    def header(self):
+        total = time.perf_counter() - self.started
+        return f"wait;dur={self.wait * 1000:.2f}, db;dur={self.db * 1000:.2f}, total;dur={total * 1000:.2f}"
+
+
+def async_url(url):
+    """The aiosqlite form of a sqlite:// URL; other URLs must already name
+    an async driver"""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    return url
+
+
+def async_engine(url, pool_size):
+    engine = create_async_engine(
+        async_url(url), echo=database.SQL_ECHO,
+        pool_size=pool_size, max_overflow=0, pool_timeout=POOL_TIMEOUT,
+    )
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", lambda dbapi_connection, record: database.set_sqlite_pragmas(dbapi_connection))
+    return engine
+
+
+def text_field(body, key, required=True):
+    value = body.get(key)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if required:
+            raise HTTPError(400, f"'{key}' is required")
+        return None
+    if not isinstance(value, str):
+        raise HTTPError(400, f"'{key}' must be a string")
+    return value.strip()
+
+
+def int_field(body, key, required=True, minimum=None):
+    value = body.get(key)
+    if value is None:
+        if required:
+            raise HTTPError(400, f"'{key}' is required")
+        return None
+    if isinstance(value, str) and value.isdigit():
+        value = int(value)
+    if (not isinstance(value, int) or isinstance(value, bool) or (minimum is not None and value < minimum)
+            or abs(value) > MAX_ID):
+        raise HTTPError(400, f"'{key}' must be an integer" + (f" >= {minimum}" if minimum is not None else ""))
+    return value
+
+
+def priority_field(body, key):
+    """A Priority from its name or value; JSON booleans and other types are refused"""
+    value = body.get(key, str(Priority.MEDIUM))
+    if isinstance(value, (str, int)) and not isinstance(value, bool):
+        try:
+            return Priority.parse(value)
+        except ValueError:
+            pass
+    raise HTTPError(400, f"'{key}' must be one of {', '.join(PRIORITIES)}")
+
+
+def date_field(body, key):
+    value = text_field(body, key, required=False)
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPError(400, f"'{key}' must be a date (YYYY-MM-DD)")
+
+
+def id_spec_field(body, key):
+    """An IdSpec from a string such as "1,4,10-20", an id or a list of ids and ranges"""
+    value = body.get(key)
+    items = value if isinstance(value, list) else [] if value is None else [value]
+    if not all(isinstance(item, (str, int)) and not isinstance(item, bool) for item in items):
+        raise HTTPError(400, f"'{key}' must be ids, ranges like \"10-20\" or \"all\", as a string or a list")
+    try:
+        return parse_id_spec(",".join(str(item) for item in items))
+    except ValueError as e:
+        raise HTTPError(400, f"'{key}': {e}")
+
+
+class APIServer:
+    """Routes requests to handlers sharing one async engine"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.sessions = async_sessionmaker(engine, expire_on_commit=False)
+        self.write_lock = asyncio.Lock()
+        self.routes = {
+            "/projects": {"POST": self.create_project},
+            "/tasks": {"POST": self.add_task},
+            "/employees": {"POST": self.add_employee},
+            "/assignments": {"POST": self.assign_employees},
+            "/workload": {"GET": self.view_workload},
+            "/report": {"GET": self.generate_report},
+        }
+
+    @contextlib.asynccontextmanager
+    async def session(self, timing, write=False):
+        """A session holding a pooled connection, timed for Server-Timing"""
+        started = time.perf_counter()
+        async with self.write_lock if write else contextlib.nullcontext():
+            async with self.sessions() as session:
+                await session.connection()
+                acquired = time.perf_counter()
+                timing.wait += acquired - started
+                try:
+                    yield session
+                finally:
+                    timing.db += time.perf_counter() - acquired
+
+    async def create_project(self, body, timing):
+        name = text_field(body, "name")
+        project = Project(name=name, description=text_field(body, "description", required=False) or "",
+                          deadline=date_field(body, "deadline"))
+        async with self.session(timing, write=True) as session:
+            session.add(project)
+            await session.commit()
+        return 201, {"id": project.id, "name": project.name}
+
+    async def add_task(self, body, timing):
+        project_id = int_field(body, "project_id")
+        priority = priority_field(body, "priority")
+        duration_days = int_field(body, "duration_days", required=False, minimum=0)
+        task = Task(
+            project_id=project_id, title=text_field(body, "title"),
+            description=text_field(body, "description", required=False) or "",
+            deadline=date_field(body, "deadline"), priority=priority,
+            duration_days=1 if duration_days is None else duration_days,
+        )
+        async with self.session(timing, write=True) as session:
+            if await session.get(Project, project_id) is None:
+                raise HTTPError(404, f"project {project_id} not found")
+            session.add(task)
+            await session.commit()
+        return 201, {"id": task.id, "project_id": project_id, "title": task.title}
+
+    async def add_employee(self, body, timing):
+        employee = Employee(name=text_field(body, "name"), role=text_field(body, "role"))
+        async with self.session(timing, write=True) as session:
+            session.add(employee)
+            await session.commit()
+        return 201, {"id": employee.id, "name": employee.name, "role": employee.role}
+
+    async def assign_employees(self, body, timing):
+        task_ids, employee_ids = id_spec_field(body, "task_ids"), id_spec_field(body, "employee_ids")
+        project_id = int_field(body, "project_id", required=False)
+        task_clauses = task_selection(task_ids, project_id)
+        employee_clause = id_spec_clause(Employee.id, employee_ids)
+        async with self.session(timing, write=True) as session:
+            # The CLI's validation, run on the session's sync connection
+            tasks, _, missing, missing_count = await session.run_sync(
+                lambda sync_session: find_existing(sync_session, Task.id, Task.title, task_clauses, task_ids))
+            if missing:
+                raise HTTPError(404, f"tasks not found: {describe_missing(missing, missing_count)}")
+            employees, _, missing, missing_count = await session.run_sync(
+                lambda sync_session: find_existing(sync_session, Employee.id, Employee.name, [employee_clause], employee_ids))
+            if missing:
+                raise HTTPError(404, f"employees not found: {describe_missing(missing, missing_count)}")
+            inserted = (await session.execute(bulk_assign_statement(task_clauses, employee_clause))).rowcount
+            await session.commit()
+        return 200, {"tasks": tasks, "employees": employees,
+                     "assigned": inserted, "existing": tasks * employees - inserted}
+
+    async def view_workload(self, query, timing):
+        sort = query.get("sort", "id")
+        if sort not in WORKLOAD_SORTS:
+            raise HTTPError(400, f"'sort' must be one of {', '.join(WORKLOAD_SORTS)}")
+        top = int_field(query, "top", required=False, minimum=1)
+        min_tasks = int_field(query, "min_tasks", required=False, minimum=0)
+        async with self.session(timing) as session:
+            rows = await session.execute(workload_query(sort=sort, top=top, min_tasks=min_tasks))
+            employees = [{"id": emp_id, "name": name, "tasks": tasks} for emp_id, name, tasks in rows]
+        return 200, {"employees": employees}
+
+    async def generate_report(self, query, timing):
+        async with self.session(timing) as session:
+            total, completed = (await session.execute(task_totals_query())).one()
+            rows = await session.stream(employee_report_query())
+            employees = [
+                {"name": name, "assigned": assigned, "completed": done}
+                async for name, assigned, done in rows
+            ]
+        return 200, {"total_tasks": total, "completed_tasks": completed, "employees": employees}
+
+    async def dispatch(self, method, target, body):
+        """(status, payload, extra headers) for one request"""
+        timing = Timing()
+        extra = []
+        try:
+            url = urlsplit(target)
+            methods = self.routes.get(url.path.rstrip("/") or "/")
+            if methods is None:
+                raise HTTPError(404, f"no endpoint {url.path}")
+            handler = methods.get(method)
+            if handler is None:
+                extra.append(("Allow", ", ".join(methods)))
+                raise HTTPError(405, f"{url.path} does not accept {method}")
+            if method == "POST":
+                try:
+                    data = json.loads(body or b"{}")
+                except ValueError as e:
+                    raise HTTPError(400, f"invalid JSON: {e}")
+                if not isinstance(data, dict):
+                    raise HTTPError(400, "expected a JSON object")
+            else:
+                data = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            status, payload = await handler(data, timing)
+        except HTTPError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception as e:
+            click.echo(f"Error handling {method} {target}: {e}", err=True)
+            status, payload = 500, {"error": "internal error"}
+        extra.append(("Server-Timing", timing.header()))
+        return status, payload, extra
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests from one client until it closes or asks to"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    await self.respond(writer, 431, {"error": "request head too large"}, [], False)
+                    break
+                request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ")
+                    headers = {}
+                    for line in header_lines:
+                        name, _, value = line.partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    await self.respond(writer, 400, {"error": "malformed request"}, [], False)
+                    break
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                if "transfer-encoding" in headers:
+                    await self.respond(writer, 411, {"error": "send a Content-Length body"}, [], False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, 413, {"error": f"body over {MAX_BODY_BYTES} bytes"}, [], False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, payload, extra = await self.dispatch(method, target, body)
+                await self.respond(writer, status, payload, extra, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload, extra, keep_alive):
+        body = json.dumps(payload, default=str).encode()
+        lines = [
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ] + [f"{name}: {value}" for name, value in extra]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(host, port, pool_size, ready=None):
+    engine = async_engine(database.DATABASE_URL, pool_size)
+    api = APIServer(engine)
+    server = await asyncio.start_server(api.handle_connection, host, port)
+    try:
+        if ready:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+    finally:
+        await engine.dispose()
+
+
+def run_server(host, port, pool_size):
+    def ready(server):
+        address = server.sockets[0].getsockname()
+        click.echo(f"Serving on http://{address[0]}:{address[1]} with up to {pool_size} database connections "
+                   "(Ctrl-C to stop)", err=True)
+
+    # Writes queued by CLI processes are applied while the server runs
+    journal = Journal.open()
+    flusher = Flusher(journal, database.sessionLocal) if journal else None
+    if flusher:
+        flusher.start()
+    try:
+        asyncio.run(serve(host, port, pool_size, ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if flusher:
+            flusher.stop()
@@ -0,0 +1,120 @@
+import os
+import shlex
+import click
+
+try:
+    import readline
+except ImportError:  # Windows without pyreadline
+    readline = None
+
+HISTORY_FILE = os.environ.get("PM_HISTORY_FILE", os.path.expanduser("~/.pm_history"))
+HISTORY_LENGTH = 1000
+PROMPT = "pm> "
+EXIT_COMMANDS = {"exit", "quit"}
+
+
+class CommandCompleter:
+    """readline completer for command names and their options"""
+
+    def __init__(self, group):
+        self.group = group
+        self.matches = []
+
+    def words(self, tokens):
+        if not tokens:
+            return sorted(self.group.commands) + sorted(EXIT_COMMANDS | {"help"})
+        command = self.group.commands.get(tokens[0])
+        if command is None:
+            return []
+        return sorted(opt for param in command.params for opt in getattr(param, "opts", []) if opt.startswith("--"))
+
+    def complete(self, text, state):
+        if state == 0:
+            line = readline.get_line_buffer()[:readline.get_begidx()]
+            try:
+                tokens = shlex.split(line)
+            except ValueError:
+                tokens = []
+            self.matches = [word for word in self.words(tokens) if word.startswith(text)]
+        return self.matches[state] if state < len(self.matches) else None
+
+
+def setup_readline(group):
+    if readline is None:
+        return
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except OSError:
+        pass
+    readline.set_history_length(HISTORY_LENGTH)
+    readline.set_completer(CommandCompleter(group).complete)
+    readline.set_completer_delims(" \t")
+    # libedit (macOS) and GNU readline spell the binding differently
+    if "libedit" in (readline.__doc__ or ""):
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+
+
+def save_history():
+    if readline is None:
+        return
+    try:
+        readline.write_history_file(HISTORY_FILE)
+    except OSError:
+        pass
+
+
+def run_command(group, args):
+    """Run one command line through the click group without exiting"""
+    try:
+        group.main(args=args, prog_name="", standalone_mode=False)
+    except click.ClickException as e:
+        e.show()
+    except click.exceptions.Abort:
+        click.echo("Aborted!", err=True)
+    except SystemExit:
+        # --help and ctx.exit() still raise SystemExit in some click paths
+        pass
+
+
+def run_shell(group, warm_up=None):
+    """Read-eval-print loop executing the group's commands in this process.
+
+    The engine, its connection pool and the configured mappers outlive each
+    command, so per-command latency is only the SQL it runs.
+    """
+    setup_readline(group)
+    if warm_up:
+        warm_up()
+    click.echo("Project Management shell. Type 'help' for commands, 'exit' to leave.")
+    try:
+        while True:
+            try:
+                line = input(PROMPT)
+            except EOFError:
+                click.echo()
+                break
+            except KeyboardInterrupt:
+                click.echo()
+                continue
+            try:
+                args = shlex.split(line)
+            except ValueError as e:
+                click.echo(f"Error: {e}", err=True)
+                continue
+            if not args:
+                continue
+            if args[0] in EXIT_COMMANDS:
+                break
+            if args[0] == "help":
+                args = args[1:] + ["--help"]
+            if args[0] == "shell":
+                click.echo("Already in the shell.", err=True)
+                continue
+            try:
+                run_command(group, args)
+            except KeyboardInterrupt:
+                click.echo("Interrupted.", err=True)
+    finally:
+        save_history()
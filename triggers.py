@@ -0,0 +1,243 @@
+"""SQLite triggers keeping denormalized data in step with the base tables.
+
+Besides the counter columns this covers the task history in task_events,
+the task timestamps and the FTS5 search index, whose virtual tables are
+not part of Base.metadata and are created here too.
+
+models.py installs these on Base.metadata so create_all() builds them;
+migrations carry their own copy of the SQL as of that revision.
+"""
+
+# Counter columns on employees/projects and the single task_totals row.
+# completed is nullable, hence the COALESCE on every read of it.
+COUNTER_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_insert_counters AFTER INSERT ON tasks
+    BEGIN
+        UPDATE projects SET task_count = task_count + 1,
+            completed_count = completed_count + COALESCE(NEW.completed, 0)
+        WHERE id = NEW.project_id;
+        UPDATE task_totals SET task_count = task_count + 1,
+            completed_count = completed_count + COALESCE(NEW.completed, 0)
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_delete_counters AFTER DELETE ON tasks
+    BEGIN
+        UPDATE projects SET task_count = task_count - 1,
+            completed_count = completed_count - COALESCE(OLD.completed, 0)
+        WHERE id = OLD.project_id;
+        UPDATE task_totals SET task_count = task_count - 1,
+            completed_count = completed_count - COALESCE(OLD.completed, 0)
+        WHERE id = 1;
+        -- Assignments still pointing at the task lose its completion now;
+        -- deleting them later only takes away the assignment itself.
+        UPDATE employees SET completed_count = completed_count - COALESCE(OLD.completed, 0)
+        WHERE id IN (SELECT employee_id FROM employee_task WHERE task_id = OLD.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_update_counters AFTER UPDATE OF completed, project_id ON tasks
+    WHEN COALESCE(OLD.completed, 0) != COALESCE(NEW.completed, 0) OR OLD.project_id IS NOT NEW.project_id
+    BEGIN
+        UPDATE projects SET task_count = task_count - 1,
+            completed_count = completed_count - COALESCE(OLD.completed, 0)
+        WHERE id = OLD.project_id;
+        UPDATE projects SET task_count = task_count + 1,
+            completed_count = completed_count + COALESCE(NEW.completed, 0)
+        WHERE id = NEW.project_id;
+        UPDATE task_totals SET
+            completed_count = completed_count + COALESCE(NEW.completed, 0) - COALESCE(OLD.completed, 0)
+        WHERE id = 1;
+        UPDATE employees SET
+            completed_count = completed_count + COALESCE(NEW.completed, 0) - COALESCE(OLD.completed, 0)
+        WHERE id IN (SELECT employee_id FROM employee_task WHERE task_id = NEW.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_employee_task_insert_counters AFTER INSERT ON employee_task
+    BEGIN
+        UPDATE employees SET task_count = task_count + 1,
+            completed_count = completed_count
+                + COALESCE((SELECT completed FROM tasks WHERE id = NEW.task_id), 0)
+        WHERE id = NEW.employee_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_employee_task_delete_counters AFTER DELETE ON employee_task
+    BEGIN
+        UPDATE employees SET task_count = task_count - 1,
+            completed_count = completed_count
+                - COALESCE((SELECT completed FROM tasks WHERE id = OLD.task_id), 0)
+        WHERE id = OLD.employee_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_employee_task_update_counters AFTER UPDATE OF task_id, employee_id ON employee_task
+    WHEN OLD.task_id IS NOT NEW.task_id OR OLD.employee_id IS NOT NEW.employee_id
+    BEGIN
+        UPDATE employees SET task_count = task_count - 1,
+            completed_count = completed_count
+                - COALESCE((SELECT completed FROM tasks WHERE id = OLD.task_id), 0)
+        WHERE id = OLD.employee_id;
+        UPDATE employees SET task_count = task_count + 1,
+            completed_count = completed_count
+                + COALESCE((SELECT completed FROM tasks WHERE id = NEW.task_id), 0)
+        WHERE id = NEW.employee_id;
+    END
+    """,
+]
+
+# Bump the single data_version row (id = 1) on every change to the data a
+# report can show, so cached reports know when they went stale. Counter
+# updates on employees/projects are not listed: the base-table change
+# that caused them bumps the version already.
+DATA_VERSION_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.split()[0].lower()}_data_version AFTER {event} ON {table}
+    BEGIN
+        UPDATE data_version SET version = version + 1 WHERE id = 1;
+    END
+    """
+    for table, events in [
+        ("projects", ["INSERT", "DELETE", "UPDATE OF name, description, deadline"]),
+        ("employees", ["INSERT", "DELETE", "UPDATE OF name, role"]),
+        ("tasks", ["INSERT", "DELETE", "UPDATE"]),
+        ("employee_task", ["INSERT", "DELETE", "UPDATE"]),
+    ]
+    for event in events
+]
+
+# Append-only history in task_events, written on every change to a task's
+# project, priority, deadline or completion and on every assignment change.
+# Task events hold the task's whole state after the change (before it, for
+# a delete), so the state at any moment is the latest event up to then.
+# Timestamps are local time, like everything else the CLI stores.
+EVENT_TIME = "strftime('%Y-%m-%d %H:%M:%f000', 'now', 'localtime')"
+
+HISTORY_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_insert_history AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO task_events (task_id, occurred_at, event, project_id, priority, deadline, completed)
+        VALUES (NEW.id, {EVENT_TIME}, 'created', NEW.project_id, NEW.priority, NEW.deadline, NEW.completed);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_update_history AFTER UPDATE OF project_id, priority, deadline, completed ON tasks
+    WHEN OLD.project_id IS NOT NEW.project_id OR OLD.priority IS NOT NEW.priority
+        OR OLD.deadline IS NOT NEW.deadline OR OLD.completed IS NOT NEW.completed
+    BEGIN
+        INSERT INTO task_events (task_id, occurred_at, event, project_id, priority, deadline, completed)
+        VALUES (NEW.id, {EVENT_TIME}, 'updated', NEW.project_id, NEW.priority, NEW.deadline, NEW.completed);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_delete_history AFTER DELETE ON tasks
+    BEGIN
+        INSERT INTO task_events (task_id, occurred_at, event, project_id, priority, deadline, completed)
+        VALUES (OLD.id, {EVENT_TIME}, 'deleted', OLD.project_id, OLD.priority, OLD.deadline, OLD.completed);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_employee_task_insert_history AFTER INSERT ON employee_task
+    BEGIN
+        INSERT INTO task_events (task_id, occurred_at, event, employee_id)
+        VALUES (NEW.task_id, {EVENT_TIME}, 'assigned', NEW.employee_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_employee_task_update_history AFTER UPDATE ON employee_task
+    WHEN OLD.task_id IS NOT NEW.task_id OR OLD.employee_id IS NOT NEW.employee_id
+    BEGIN
+        INSERT INTO task_events (task_id, occurred_at, event, employee_id)
+        VALUES (OLD.task_id, {EVENT_TIME}, 'unassigned', OLD.employee_id);
+        INSERT INTO task_events (task_id, occurred_at, event, employee_id)
+        VALUES (NEW.task_id, {EVENT_TIME}, 'assigned', NEW.employee_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_employee_task_delete_history AFTER DELETE ON employee_task
+    BEGIN
+        INSERT INTO task_events (task_id, occurred_at, event, employee_id)
+        VALUES (OLD.task_id, {EVENT_TIME}, 'unassigned', OLD.employee_id);
+    END
+    """,
+]
+
+# Fill tasks.created_at and completed_at for writes that do not set them,
+# e.g. plain SQL. The CLI sets both itself, so for its writes the WHEN
+# clauses are false and no second UPDATE runs.
+TIMESTAMP_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_insert_timestamps AFTER INSERT ON tasks
+    WHEN NEW.created_at IS NULL OR (NEW.completed AND NEW.completed_at IS NULL)
+    BEGIN
+        UPDATE tasks SET created_at = COALESCE(created_at, {EVENT_TIME}),
+            completed_at = CASE WHEN completed THEN COALESCE(completed_at, {EVENT_TIME}) END
+        WHERE id = NEW.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_update_timestamps AFTER UPDATE OF completed ON tasks
+    WHEN COALESCE(OLD.completed, 0) != COALESCE(NEW.completed, 0) AND OLD.completed_at IS NEW.completed_at
+    BEGIN
+        UPDATE tasks SET completed_at = CASE WHEN NEW.completed THEN {EVENT_TIME} END WHERE id = NEW.id;
+    END
+    """,
+]
+
+# External-content FTS5 indexes over the searchable text columns. They hold
+# only the index, the text itself is read back from tasks/projects. bm25
+# weights a match in the title/name ten times one in the description.
+SEARCH_TABLES = {
+    "tasks_fts": ("tasks", ["title", "description"]),
+    "projects_fts": ("projects", ["name", "description"]),
+}
+
+
+def search_table_ddl(name, table, columns):
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5(
+            {', '.join(columns)}, content='{table}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        """,
+        f"INSERT INTO {name} ({name}, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+    ]
+
+
+def search_trigger_ddl(name, table, columns):
+    cols = ", ".join(columns)
+    new = ", ".join(f"NEW.{column}" for column in columns)
+    old = ", ".join(f"OLD.{column}" for column in columns)
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_insert_search AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO {name} (rowid, {cols}) VALUES (NEW.id, {new});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_delete_search AFTER DELETE ON {table}
+        BEGIN
+            INSERT INTO {name} ({name}, rowid, {cols}) VALUES ('delete', OLD.id, {old});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_update_search AFTER UPDATE OF {cols} ON {table}
+        BEGIN
+            INSERT INTO {name} ({name}, rowid, {cols}) VALUES ('delete', OLD.id, {old});
+            INSERT INTO {name} (rowid, {cols}) VALUES (NEW.id, {new});
+        END
+        """,
+    ]
+
+
+SEARCH_DDL = [
+    statement
+    for name, (table, columns) in SEARCH_TABLES.items()
+    for statement in search_table_ddl(name, table, columns) + search_trigger_ddl(name, table, columns)
+]